@@ -1,18 +1,29 @@
 """
-Hugging Face Spaces Entry Point: Interactive Review Mode
+Hugging Face Spaces Entry Point
 
 Architecture Strategy: HF Spaces-optimized deployment
 - Port management: Delegated to platform
 - Resource constraints: Optimized model loading
 - User experience: Clear value proposition
+
+Єдина точка входу для всіх UI режимів:
+- interactive (default): Interactive Review з ручним підтвердженням сутностей
+- legacy: класичний GradioInterface з file I/O
+
+    python app.py --mode legacy
+
+app_old.py та app_interactive_review.py лишились тонкими обгортками.
 """
 
+import argparse
 import logging
 import sys
 import os
+import threading
+from typing import List, Optional
 
-from core.analyzer import HybridAnalyzer
-from ui.interactive_review import create_interactive_review_interface
+# Важкі модулі (spaCy, Presidio, Gradio) імпортуються всередині функцій:
+# warmup-потік стартує до їх імпорту і вантажить модель паралельно з UI
 
 
 def setup_logging():
@@ -29,11 +40,58 @@ def setup_logging():
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
-def warmup_models():
+# Доступні UI режими; перший - режим за замовчуванням (HF Spaces)
+MODES = ("interactive", "legacy")
+
+
+# Тексти для прогріву: без сутностей, з NER сутностями та з patterns
+WARMUP_SAMPLES = (
+    "Привіт",
+    "Петро Порошенко зустрівся з представниками ТОВ 'Приват' у Києві.",
+    "Пишіть на email@test.com або телефонуйте +380501234567.",
+)
+
+
+def available_cpus() -> int:
     """
-    CRITICAL for HF Spaces: Pre-load before health check
+    Кількість CPU, реально доступних контейнеру.
     
-    HF Spaces expects fast startup (<60s for health check)
+    os.cpu_count() у контейнері HF Spaces повертає ядра хоста, а не
+    cgroup-квоту - torch тоді запускає десятки OpenMP потоків на 2 vCPU.
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS/Windows
+        return os.cpu_count() or 1
+
+
+def configure_threads():
+    """
+    Фіксує розмір thread pools до першого імпорту torch.
+    
+    Значення через setdefault: явні змінні оточення мають пріоритет.
+    """
+    num_threads = str(available_cpus())
+    os.environ.setdefault("OMP_NUM_THREADS", num_threads)
+    os.environ.setdefault("MKL_NUM_THREADS", num_threads)
+    # Токенізація виконується в потоці запиту - власний пул Rust не потрібен
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def warmup_models(ready_event: Optional[threading.Event] = None):
+    """
+    CRITICAL for HF Spaces: Pre-load model without blocking health check
+    
+    HF Spaces expects fast startup (<60s for health check), тому warmup
+    виконується у фоновому потоці, а ready_event сигналізує UI про готовність.
     """
     logger = logging.getLogger(__name__)
     logger.info("=" * 60)
@@ -41,16 +99,109 @@ def warmup_models():
     logger.info("=" * 60)
     
     try:
-        from recognizers.ukrainian_ner import UkrainianNERRecognizer
-        recognizer = UkrainianNERRecognizer()
-        recognizer._load_model()
+        import torch
+        from core.model_registry import get_analyzer, get_anonymizer, get_nlp
+        
+        # Inter-op паралелізм не потрібен: один forward pass на запит.
+        # Можна виставити тільки до першої паралельної операції torch
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            logger.warning("torch inter-op threads already initialized")
+        
+        # Єдині екземпляри процесу: UI отримає ті самі об'єкти
+        get_nlp()
+        get_anonymizer()
+        analyzer = get_analyzer()
         logger.info("✓ Model loaded successfully")
+        
+        # Прогрівочний інференс: лінива ініціалізація torch/spaCy-transformers
+        # і Presidio відбувається тут, а не на першому запиті користувача
+        for sample in WARMUP_SAMPLES:
+            analyzer.analyze(sample)
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+        logger.info("✓ Warmup inference completed")
         logger.info("=" * 60)
     except Exception as e:
         logger.error(f"✗ Model warmup failed: {e}", exc_info=True)
+    finally:
+        # Навіть при помилці відпускаємо UI: analyze() зробить lazy retry
+        if ready_event is not None:
+            ready_event.set()
 
 
-def main():
+def validate_environment():
+    """
+    Pre-flight environment validation (legacy режим).
+    
+    Catches dependency issues before user interaction.
+    """
+    logger = logging.getLogger(__name__)
+    
+    try:
+        import gradio as gr
+        import spacy
+        
+        # Version reporting
+        logger.info(f"Gradio: {gr.__version__}")
+        logger.info(f"spaCy: {spacy.__version__}")
+        
+        # Compatibility checks
+        from core.dependencies import GradioCompatibility
+        GradioCompatibility.validate_compatibility()
+        
+        logger.info("✓ Environment validation passed")
+        
+    except Exception as e:
+        logger.error(f"✗ Environment validation failed: {e}")
+        # Continue anyway - fail gracefully at runtime
+
+
+def parse_mode(argv: Optional[List[str]] = None) -> str:
+    """Читає UI режим з --mode (або змінної оточення APP_MODE)."""
+    parser = argparse.ArgumentParser(description="Ukrainian NER + Presidio Demo")
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default=os.getenv("APP_MODE", MODES[0]),
+        help="UI режим (default: %(default)s)"
+    )
+    return parser.parse_args(argv).mode
+
+
+def launch_interface(mode: str, ready_event: threading.Event):
+    """
+    Factory: будує та запускає UI обраного режиму.
+    
+    UI модулі імпортуються всередині гілок - код іншого режиму
+    не потрапляє в граф імпортів процесу.
+    """
+    if mode == "legacy":
+        from ui.gradio_interface import create_interface
+        
+        # GradioInterface сам обирає host/port (див. GradioInterface.launch)
+        create_interface().launch()
+        return
+    
+    from core.model_registry import get_analyzer
+    from ui.interactive_review import create_interactive_review_interface
+    
+    # Модель підвантажується lazy; перший аналіз чекає на ready_event
+    interface = create_interactive_review_interface(get_analyzer(), ready_event)
+    
+    # HF Spaces Configuration:
+    # - server_name="0.0.0.0" (required for external access)
+    # - No server_port (platform manages this)
+    # - show_error=True (helpful for debugging)
+    interface.launch(
+        server_name="0.0.0.0",  # Required for HF Spaces
+        show_error=True,
+        # share=False is default, HF provides public URL automatically
+    )
+
+
+def main(mode: Optional[str] = None):
     """
     Main entry point optimized for HF Spaces
     
@@ -58,35 +209,38 @@ def main():
     - No explicit port configuration (HF manages this)
     - Graceful error handling for platform constraints
     - Clear user-facing messaging
+    
+    Args:
+        mode: UI режим з MODES; None - прочитати з командного рядка
     """
+    if mode is None:
+        mode = parse_mode()
+    elif mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Available: {list(MODES)}")
+    
+    configure_threads()
     setup_logging()
     logger = logging.getLogger(__name__)
     
     logger.info("=" * 60)
-    logger.info("Interactive Review UI - Starting on Hugging Face Spaces")
+    logger.info(f"Ukrainian NER + Presidio Demo - Starting ({mode} mode)")
     logger.info("=" * 60)
     
     try:
-        # Phase 1: Model warmup
-        warmup_models()
-        
-        # Phase 2: Initialize analyzer
-        analyzer = HybridAnalyzer()
-        
-        # Phase 3: Create UI
-        interface = create_interactive_review_interface(analyzer)
+        # Phase 1: Model warmup у фоні - порт відкривається одразу
+        warmup_event = threading.Event()
+        threading.Thread(
+            target=warmup_models,
+            args=(warmup_event,),
+            name="model-warmup",
+            daemon=True
+        ).start()
         
-        # Phase 4: Launch
-        # HF Spaces Configuration:
-        # - server_name="0.0.0.0" (required for external access)
-        # - No server_port (platform manages this)
-        # - show_error=True (helpful for debugging)
+        if mode == "legacy":
+            validate_environment()
         
-        interface.launch(
-            server_name="0.0.0.0",  # Required for HF Spaces
-            show_error=True,
-            # share=False is default, HF provides public URL automatically
-        )
+        # Phase 2: Create and launch UI
+        launch_interface(mode, warmup_event)
         
     except KeyboardInterrupt:
         logger.info("Shutting down gracefully...")
@@ -96,4 +250,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
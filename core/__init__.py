@@ -7,7 +7,6 @@ Core functionality: аналіз та конфігурація.
 Public API для імпорту з інших модулів.
 """
 from core.config import config, AppConfig, EntityConfig
-from core.analyzer import HybridAnalyzer, AnalysisResult
 
 __all__ = [
     "config",
@@ -15,4 +14,15 @@ __all__ = [
     "EntityConfig",
     "HybridAnalyzer",
     "AnalysisResult"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """
+    Lazy re-export: core.analyzer тягне Presidio та spaCy (секунди імпорту),
+    тому легкі модулі (core.config, core.model_registry) імпортуються без них.
+    """
+    if name in ("HybridAnalyzer", "AnalysisResult"):
+        from core import analyzer
+        return getattr(analyzer, name)
+    raise AttributeError(f"module 'core' has no attribute '{name}'")
@@ -9,46 +9,83 @@ conflict resolution та anonymization.
 приховуючи складність внутрішньої оркестрації.
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
-from presidio_analyzer import RecognizerResult
-from presidio_anonymizer import AnonymizerEngine
+from presidio_analyzer import PatternRecognizer, RecognizerResult
 from presidio_anonymizer.entities import OperatorConfig
 
-from core.config import config
-from recognizers.ukrainian_ner import UkrainianNERRecognizer
-from recognizers.presidio_patterns import PresidioPatternRecognizer
+from core.config import DATACLASS_SLOTS, config
+from core.model_registry import get_anonymizer
+from recognizers.ukrainian_ner import get_ukrainian_ner
+from recognizers.presidio_patterns import get_pattern_recognizer
 from utils.conflict_resolution import remove_overlapping_entities
 
 logger = logging.getLogger(__name__)
 
+_by_start = attrgetter("start")
 
-@dataclass
+
+@functools.lru_cache(maxsize=1)
+def _get_pattern_executor() -> ThreadPoolExecutor:
+    """
+    Спільний на процес пул для pattern аналізу.
+    
+    Один пул на всі HybridAnalyzer: екземпляри з тестів чи коду
+    викликача не залишають після себе незакритих worker потоків.
+    """
+    return ThreadPoolExecutor(
+        max_workers=config.PATTERN_ANALYSIS_WORKERS,
+        thread_name_prefix="pattern-analysis"
+    )
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AnalysisResult:
     """
     Структурований результат аналізу.
     
     Design Principle: Immutable data objects для передачі між шарами.
+    Slots: без __dict__ на кожен екземпляр (batch створює їх сотнями).
     """
     entities: List[RecognizerResult]
     anonymized_text: str
     original_text: str
     entities_count: int
+    # Кеш format_entities_list (не частина даних результату)
+    _entities_list_text: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def format_entities_list(self) -> str:
         """
         Форматує список знайдених сутностей для відображення.
         
+        Рядок будується один раз на результат: UI може перемальовувати
+        його багато разів, а сутності після аналізу не змінюються.
+        
         Returns:
             Текстове представлення сутностей з позиціями та scores
         """
+        if self._entities_list_text is None:
+            # frozen dataclass: кеш записуємо в обхід __setattr__
+            object.__setattr__(self, "_entities_list_text", self._build_entities_list())
+        return self._entities_list_text
+    
+    def _build_entities_list(self) -> str:
         if not self.entities:
             return "Сутностей не знайдено"
         
         # Сортуємо за позицією в тексті
-        sorted_entities = sorted(self.entities, key=lambda x: x.start)
+        sorted_entities = sorted(self.entities, key=_by_start)
         
         lines = []
         for idx, entity in enumerate(sorted_entities, 1):
@@ -68,7 +105,7 @@ class HybridAnalyzer:
     Гібридний аналізатор об'єднує NER та pattern-based підходи.
     
     Архітектурна стратегія:
-    1. Паралельний запуск NER + Presidio (можна оптимізувати async)
+    1. Паралельний запуск NER + Presidio (patterns у пулі потоків)
     2. Інтелігентне злиття результатів
     3. Розв'язання конфліктів
     4. Централізована анонімізація
@@ -81,10 +118,31 @@ class HybridAnalyzer:
         Ініціалізація компонентів системи.
         
         Lazy initialization: recognizers завантажуються при першому виклику.
+        AnonymizerEngine спільний для процесу (core.model_registry).
         """
-        self.ner_recognizer = UkrainianNERRecognizer()
-        self.pattern_recognizer = PresidioPatternRecognizer()
-        self.anonymizer = AnonymizerEngine()
+        self.ner_recognizer = get_ukrainian_ner()
+        self.pattern_recognizer = get_pattern_recognizer()
+        self.anonymizer = get_anonymizer()
+        
+        # Operators для всіх відомих типів будуються один раз на формат
+        # анонімізації (див. operators_for - невідомі типи додаються при
+        # першій появі, зміна DEFAULT_ANONYMIZATION_FORMAT перебудовує кеш)
+        self._operators_format = config.DEFAULT_ANONYMIZATION_FORMAT
+        self._operators: Dict[str, OperatorConfig] = self._build_operators(
+            self._operators_format
+        )
+        
+        # LRU кеш: ключ (хеш тексту, типи, стратегія) -> відфільтровані
+        # сутності; анонімізація при hit перезапускається - вона дешева
+        self._cache: "OrderedDict[tuple, Tuple[RecognizerResult, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # Pattern аналіз іде в пулі паралельно з NER у потоці запиту:
+        # torch відпускає GIL у forward pass, тож regex-и Presidio
+        # виконуються в тіні трансформера
+        self._pattern_executor = _get_pattern_executor()
         
         logger.info("HybridAnalyzer initialized")
     
@@ -124,52 +182,224 @@ class HybridAnalyzer:
         
         # Використовуємо конфіг за замовчуванням якщо не вказано
         if ukrainian_entities is None:
-            ukrainian_entities = config.get_enabled_ukrainian_entities()
+            ukrainian_entities = config.get_enabled_ukrainian_set()
         
         if presidio_entities is None:
             presidio_entities = config.get_enabled_presidio_entities()
         
+        cache_key = self._cache_key(
+            text, ukrainian_entities, presidio_entities, conflict_strategy
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Analysis cache hit: %d entities", len(cached))
+            return self._make_result(text, list(cached))
+        
         logger.info(
-            f"Starting analysis: {len(ukrainian_entities)} NER types, "
-            f"{len(presidio_entities)} pattern types"
+            "Starting analysis: %d NER types, %d pattern types",
+            len(ukrainian_entities),
+            len(presidio_entities)
         )
         
-        # === ЕТАП 2: NER Аналіз ===
-        all_results = []
-        operators = {}
+        # === ЕТАП 2-3: Pattern аналіз у пулі паралельно з NER ===
+        pattern_future = None
+        if presidio_entities:
+            pattern_future = self._pattern_executor.submit(
+                self._run_patterns, [text], presidio_entities
+            )
         
+        ner_results, ner_ok = [], True
         if ukrainian_entities:
+            ner_results, ner_ok = self._run_ner(text, ukrainian_entities)
+        
+        pattern_results, pattern_ok = [[]], [True]
+        if pattern_future is not None:
+            pattern_results, pattern_ok = pattern_future.result()
+        
+        all_results = [*ner_results, *pattern_results[0]]
+        # Неповний результат (впав recognizer) не кешуємо
+        complete = ner_ok and pattern_ok[0]
+        
+        # === ЕТАП 4: Conflict Resolution ===
+        filtered_results = self._resolve_conflicts(text, all_results, conflict_strategy)
+        if complete:
+            self._cache_put(cache_key, filtered_results)
+        
+        # === ЕТАП 5-6: Анонімізація + результат ===
+        return self._make_result(text, filtered_results)
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        ukrainian_entities: List[str] = None,
+        presidio_entities: List[str] = None,
+        conflict_strategy: str = "score"
+    ) -> List[AnalysisResult]:
+        """
+        Аналізує список текстів з одним батчевим NER проходом.
+        
+        Продуктивність: трансформер отримує всі тексти через nlp.pipe -
+        один forward pass на батч замість одного на текст, що амортизує
+        Python overhead та запуск kernels. Pattern аналіз, conflict
+        resolution та анонімізація дешеві й виконуються по кожному тексту.
+        
+        Args:
+            texts: Тексти для аналізу
+            ukrainian_entities: Список NER сутностей для пошуку
+            presidio_entities: Список Presidio сутностей для пошуку
+            conflict_strategy: Стратегія розв'язання конфліктів ("score" або "priority")
+        
+        Returns:
+            AnalysisResult для кожного тексту в тому ж порядку
+            
+        Raises:
+            ValueError: Некоректний хоча б один текст
+            RuntimeError: Помилка під час анонімізації
+        """
+        for text in texts:
+            self._validate_input(text)
+        
+        if ukrainian_entities is None:
+            ukrainian_entities = config.get_enabled_ukrainian_set()
+        
+        if presidio_entities is None:
+            presidio_entities = config.get_enabled_presidio_entities()
+        
+        keys = [
+            self._cache_key(text, ukrainian_entities, presidio_entities, conflict_strategy)
+            for text in texts
+        ]
+        filtered: List[Optional[List[RecognizerResult]]] = []
+        for key in keys:
+            cached = self._cache_get(key)
+            filtered.append(None if cached is None else list(cached))
+        
+        # Повний аналіз тільки для текстів, яких немає в кеші
+        pending = [idx for idx, results in enumerate(filtered) if results is None]
+        pending_texts = [texts[idx] for idx in pending]
+        
+        logger.info(
+            "Starting batch analysis of %d texts (%d cached): "
+            "%d NER types, %d pattern types",
+            len(texts),
+            len(texts) - len(pending),
+            len(ukrainian_entities),
+            len(presidio_entities)
+        )
+        
+        pattern_future = None
+        if presidio_entities and pending_texts:
+            pattern_future = self._pattern_executor.submit(
+                self._run_patterns, pending_texts, presidio_entities
+            )
+        
+        all_results: List[List[RecognizerResult]] = [[] for _ in pending]
+        complete = [True] * len(pending)
+        
+        if ukrainian_entities and pending_texts:
             try:
-                ner_results = self.ner_recognizer.analyze(text, ukrainian_entities)
-                all_results.extend(ner_results)
-                
-                # Налаштовуємо operators для NER сутностей
-                for entity_type in ukrainian_entities:
-                    operators[entity_type] = self._create_operator(entity_type)
-                
-                logger.info(f"NER found {len(ner_results)} entities")
+                batch_results = self.ner_recognizer.analyze_batch(
+                    pending_texts,
+                    ukrainian_entities
+                )
+                for results, ner_results in zip(all_results, batch_results):
+                    results.extend(ner_results)
             except Exception as e:
-                logger.error(f"NER analysis failed: {e}")
-                # Продовжуємо з pattern analysis навіть якщо NER провалився
+                logger.error("Batch NER analysis failed: %s", e)
+                complete = [False] * len(pending)
         
-        # === ЕТАП 3: Pattern Аналіз ===
-        if presidio_entities:
+        if pattern_future is not None:
+            pattern_results, pattern_ok = pattern_future.result()
+            for pos, results in enumerate(pattern_results):
+                all_results[pos].extend(results)
+                complete[pos] = complete[pos] and pattern_ok[pos]
+        
+        for pos, idx in enumerate(pending):
+            filtered[idx] = self._resolve_conflicts(
+                texts[idx], all_results[pos], conflict_strategy
+            )
+            if complete[pos]:
+                self._cache_put(keys[idx], filtered[idx])
+        
+        return [
+            self._make_result(text, results)
+            for text, results in zip(texts, filtered)
+        ]
+    
+    async def analyze_async(
+        self,
+        text: str,
+        ukrainian_entities: List[str] = None,
+        presidio_entities: List[str] = None,
+        conflict_strategy: str = "score"
+    ) -> AnalysisResult:
+        """
+        Async версія analyze() для event loop Gradio.
+        
+        Аналіз виконується у worker потоці - event loop лишається
+        вільним для інших користувачів на час forward pass.
+        """
+        return await asyncio.to_thread(
+            self.analyze,
+            text,
+            ukrainian_entities,
+            presidio_entities,
+            conflict_strategy
+        )
+    
+    def _run_ner(
+        self,
+        text: str,
+        ukrainian_entities: List[str]
+    ) -> Tuple[List[RecognizerResult], bool]:
+        """NER аналіз; помилка логується і не зупиняє pattern analysis."""
+        try:
+            ner_results = self.ner_recognizer.analyze(text, ukrainian_entities)
+            logger.info("NER found %d entities", len(ner_results))
+            return ner_results, True
+        except Exception as e:
+            logger.error("NER analysis failed: %s", e)
+            return [], False
+    
+    def _run_patterns(
+        self,
+        texts: List[str],
+        presidio_entities: List[str]
+    ) -> Tuple[List[List[RecognizerResult]], List[bool]]:
+        """
+        Pattern аналіз списку текстів (виконується в _pattern_executor).
+        
+        Returns:
+            Tuple: (результати для кожного тексту, ознаки успіху)
+        """
+        if len(texts) > 1:
             try:
-                pattern_results = self.pattern_recognizer.analyze(
-                    text, 
-                    presidio_entities
-                )
-                all_results.extend(pattern_results)
-                
-                # Налаштовуємо operators для Presidio сутностей
-                for entity_type in presidio_entities:
-                    operators[entity_type] = self._create_operator(entity_type)
-                
-                logger.info(f"Pattern analysis found {len(pattern_results)} entities")
+                all_results = self.pattern_recognizer.analyze_batch(texts, presidio_entities)
+                return all_results, [True] * len(texts)
             except Exception as e:
-                logger.error(f"Pattern analysis failed: {e}")
+                logger.warning("Pattern batch analysis failed, retrying per text: %s", e)
         
-        # === ЕТАП 4: Conflict Resolution ===
+        # Поштучно: помилка одного тексту не скасовує результати інших
+        all_results, succeeded = [], []
+        for text in texts:
+            try:
+                pattern_results = self.pattern_recognizer.analyze(text, presidio_entities)
+                logger.info("Pattern analysis found %d entities", len(pattern_results))
+                all_results.append(pattern_results)
+                succeeded.append(True)
+            except Exception as e:
+                logger.error("Pattern analysis failed: %s", e)
+                all_results.append([])
+                succeeded.append(False)
+        return all_results, succeeded
+    
+    def _resolve_conflicts(
+        self,
+        text: str,
+        all_results: List[RecognizerResult],
+        conflict_strategy: str
+    ) -> List[RecognizerResult]:
+        """Санітизує координати та прибирає перекривні сутності."""
         sanitized_results = self._sanitize_results(text, all_results)
 
         if sanitized_results:
@@ -178,17 +408,32 @@ class HybridAnalyzer:
                 strategy=conflict_strategy
             )
             logger.info(
-                f"After conflict resolution: {len(filtered_results)} entities "
-                f"(removed {len(sanitized_results) - len(filtered_results)} overlaps)"
+                "After conflict resolution: %d entities (removed %d overlaps)",
+                len(filtered_results),
+                len(sanitized_results) - len(filtered_results)
             )
         else:
             filtered_results = []
             logger.info("No entities found")
         
-        # === ЕТАП 5: Анонімізація ===
-        anonymized_text = self._anonymize(text, filtered_results, operators)
+        return filtered_results
+    
+    def _make_result(
+        self,
+        text: str,
+        filtered_results: List[RecognizerResult]
+    ) -> AnalysisResult:
+        """Анонімізує текст і формує AnalysisResult."""
+        # Без сутностей текст не змінюється: не будуємо operators і не
+        # викликаємо anonymizer
+        anonymized_text = text
+        if filtered_results:
+            anonymized_text = self._anonymize(
+                text,
+                filtered_results,
+                self.operators_for(filtered_results)
+            )
         
-        # === ЕТАП 6: Формування результату ===
         return AnalysisResult(
             entities=filtered_results,
             anonymized_text=anonymized_text,
@@ -196,6 +441,66 @@ class HybridAnalyzer:
             entities_count=len(filtered_results)
         )
     
+    def _cache_key(
+        self,
+        text: str,
+        ukrainian_entities: List[str],
+        presidio_entities: List[str],
+        conflict_strategy: str
+    ) -> tuple:
+        """
+        Ключ кешу: digest замість тексту - до 100K символів на запис.
+        
+        Версія registry patterns робить застарілими записи, зроблені до
+        add_custom_recognizer на спільному PresidioPatternRecognizer.
+        """
+        return (
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+            tuple(sorted(ukrainian_entities)),
+            tuple(sorted(presidio_entities)),
+            conflict_strategy,
+            self.pattern_recognizer.registry_version
+        )
+    
+    def _cache_get(self, key: tuple) -> Optional[Tuple[RecognizerResult, ...]]:
+        """Повертає закешовані сутності (і оновлює LRU порядок) або None."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return cached
+    
+    def _cache_put(self, key: tuple, results: List[RecognizerResult]) -> None:
+        """Зберігає сутності, витісняючи найдавніший запис при переповненні."""
+        if config.ANALYSIS_CACHE_SIZE <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = tuple(results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > config.ANALYSIS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Очищає кеш результатів (наприклад, після зміни recognizers)."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def add_custom_recognizer(self, recognizer: PatternRecognizer) -> None:
+        """
+        Реєструє кастомний pattern recognizer і скидає кеш результатів.
+        
+        Закешовані результати пораховані без нового recognizer - після
+        реєстрації вони застарілі.
+        
+        Args:
+            recognizer: Екземпляр PatternRecognizer для реєстрації
+        """
+        self.pattern_recognizer.add_custom_recognizer(recognizer)
+        self.clear_cache()
+    
     def _validate_input(self, text: str) -> None:
         """
         Валідує вхідний текст.
@@ -222,17 +527,31 @@ class HybridAnalyzer:
         text: str,
         results: List[RecognizerResult]
     ) -> List[RecognizerResult]:
-        """Нормалізує координати сутностей відносно довжини тексту."""
+        """
+        Нормалізує координати сутностей відносно довжини тексту.
+
+        Коректні сутності повертаються як є; новий RecognizerResult
+        створюється лише для обрізаних діапазонів (баг recognizer-а).
+        """
         if not results:
             return []
 
-        sanitized: List[RecognizerResult] = []
         text_length = len(text)
 
+        # Типовий випадок: всі діапазони коректні - один прохід без алокацій
+        if all(0 <= r.start < r.end <= text_length for r in results):
+            return list(results)
+
+        sanitized: List[RecognizerResult] = []
+
         for result in results:
             start = max(0, result.start)
             end = min(text_length, result.end)
 
+            if start == result.start and end == result.end and start < end:
+                sanitized.append(result)
+                continue
+
             if start >= end:
                 logger.warning(
                     "Discarding entity %s з некоректним діапазоном %s-%s для тексту довжиною %s",
@@ -266,7 +585,55 @@ class HybridAnalyzer:
 
         return sanitized
 
-    def _create_operator(self, entity_type: str) -> OperatorConfig:
+    def operators_for(
+        self,
+        results: List[RecognizerResult]
+    ) -> Dict[str, OperatorConfig]:
+        """
+        Повертає закешовані operators для типів, що є в results.
+        
+        Типи поза конфігом (наприклад, з кастомних recognizers)
+        створюються один раз і теж потрапляють у кеш. Кеш прив'язаний до
+        config.DEFAULT_ANONYMIZATION_FORMAT: після зміни формату operators
+        будуються заново.
+        """
+        anonymization_format = config.DEFAULT_ANONYMIZATION_FORMAT
+        cached_operators = self._operators
+        if anonymization_format != self._operators_format:
+            # Новий словник замість очищення: паралельні запити зі старим
+            # посиланням дочитують свій формат без гонки
+            cached_operators = self._operators = self._build_operators(anonymization_format)
+            self._operators_format = anonymization_format
+        
+        operators = {}
+        for result in results:
+            entity_type = result.entity_type
+            if entity_type in operators:
+                continue
+            operator = cached_operators.get(entity_type)
+            if operator is None:
+                operator = cached_operators.setdefault(
+                    entity_type,
+                    self._create_operator(entity_type, anonymization_format)
+                )
+            operators[entity_type] = operator
+        return operators
+    
+    def _build_operators(self, anonymization_format: str) -> Dict[str, OperatorConfig]:
+        """Operators для всіх типів з конфігу у заданому форматі."""
+        return {
+            entity_type: self._create_operator(entity_type, anonymization_format)
+            for entity_type in (
+                *config.UKRAINIAN_ENTITIES,
+                *config.PRESIDIO_PATTERN_ENTITIES
+            )
+        }
+    
+    def _create_operator(
+        self,
+        entity_type: str,
+        anonymization_format: Optional[str] = None
+    ) -> OperatorConfig:
         """
         Створює operator config для анонімізації сутності.
 
@@ -275,11 +642,13 @@ class HybridAnalyzer:
         
         Args:
             entity_type: Тип сутності
+            anonymization_format: Шаблон заміни; None - з конфігу
             
         Returns:
             OperatorConfig для Presidio Anonymizer
         """
-        anonymization_format = config.DEFAULT_ANONYMIZATION_FORMAT
+        if anonymization_format is None:
+            anonymization_format = config.DEFAULT_ANONYMIZATION_FORMAT
         
         return OperatorConfig(
             "replace",
@@ -310,7 +679,7 @@ class HybridAnalyzer:
             anonymized = self.anonymizer.anonymize(text, results, operators)
             return anonymized.text
         except Exception as e:
-            logger.error(f"Anonymization failed: {e}")
+            logger.error("Anonymization failed: %s", e)
             raise RuntimeError(f"Помилка анонімізації: {e}") from e
     
     def get_system_info(self) -> Dict[str, any]:
@@ -325,5 +694,8 @@ class HybridAnalyzer:
             "ner_model_repo": config.MODEL_REPO,
             "supported_ukrainian_entities": list(config.UKRAINIAN_ENTITIES.keys()),
             "supported_presidio_entities": list(config.PRESIDIO_PATTERN_ENTITIES.keys()),
-            "max_text_length": config.MAX_TEXT_LENGTH
+            "max_text_length": config.MAX_TEXT_LENGTH,
+            "analysis_cache_size": len(self._cache),
+            "analysis_cache_hits": self._cache_hits,
+            "analysis_cache_misses": self._cache_misses
         }
@@ -5,11 +5,16 @@
 Це дозволяє легко модифікувати поведінку системи без зміни коду.
 """
 
+import os
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional
 
+# __slots__ для dataclass доступні з Python 3.10; на 3.9 - звичайний __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class EntityConfig:
     """Конфігурація для окремої сутності."""
     name: str
@@ -29,6 +34,35 @@ class AppConfig:
     MAX_TEXT_LENGTH: int = 100_000
     MAX_BATCH_SIZE: int = 100
     
+    # Продуктивність NER: скільки текстів йде в один forward pass nlp.pipe
+    NER_BATCH_SIZE: int = 8
+    
+    # Довгі тексти ріжуться по межах речень на шматки до стількох символів
+    # і йдуть у nlp.pipe: пік пам'яті активацій обмежений розміром шматка
+    # (0 - вимкнено)
+    NER_CHUNK_SIZE: int = 2000
+    
+    # Точність ваг трансформера: "fp32", "bf16" (CPU з AVX-512 BF16 / AMX,
+    # сучасні GPU), "fp16" (тільки GPU) або "int8" (CPU, VNNI; з
+    # NER_BACKEND="onnx" - квантизація ONNX Runtime)
+    NER_PRECISION: str = "fp32"
+    
+    # Пристрій трансформера: "auto" (GPU, якщо spaCy його бачить), "cuda"
+    # (GPU обов'язковий) або "cpu". Змінна оточення UK_NER_DEVICE
+    NER_DEVICE: str = field(default_factory=lambda: os.getenv("UK_NER_DEVICE", "auto"))
+    
+    # Рушій трансформера: "torch" (eager PyTorch) або "onnx" (ONNX Runtime,
+    # експорт кешується в NER_ONNX_CACHE_DIR за SHA snapshot моделі;
+    # onnxruntime/onnx - з requirements-optional.txt)
+    NER_BACKEND: str = "torch"
+    NER_ONNX_CACHE_DIR: str = "~/.cache/uk-ner-presidio/onnx"
+    
+    # Потоки для pattern аналізу, що виконується паралельно з NER
+    PATTERN_ANALYSIS_WORKERS: int = 4
+    
+    # LRU кеш результатів HybridAnalyzer за хешем тексту (0 - вимкнено)
+    ANALYSIS_CACHE_SIZE: int = 512
+    
     # Налаштування анонімізації
     DEFAULT_ANONYMIZATION_FORMAT: str = "[{entity_type}]"
     
@@ -61,19 +95,37 @@ class AppConfig:
         "DATE_TIME": EntityConfig("DATE_TIME", "Дата і час разом")
     })
     
+    def __post_init__(self):
+        # Кеші активних сутностей: analyze() читає їх на кожному виклику,
+        # а змінюються вони тільки через update_entity_state()
+        self._enabled_uk_cache: Optional[List[str]] = None
+        self._enabled_uk_set: Optional[FrozenSet[str]] = None
+        self._enabled_presidio_cache: Optional[List[str]] = None
+    
     def get_enabled_ukrainian_entities(self) -> List[str]:
         """Повертає список активних українських сутностей."""
-        return [
-            name for name, config in self.UKRAINIAN_ENTITIES.items() 
-            if config.enabled
-        ]
+        if self._enabled_uk_cache is None:
+            self._enabled_uk_cache = [
+                name for name, config in self.UKRAINIAN_ENTITIES.items() 
+                if config.enabled
+            ]
+        # Копія: виклик не може зіпсувати кеш
+        return list(self._enabled_uk_cache)
+    
+    def get_enabled_ukrainian_set(self) -> FrozenSet[str]:
+        """Активні українські сутності як frozenset (без копіювання)."""
+        if self._enabled_uk_set is None:
+            self._enabled_uk_set = frozenset(self.get_enabled_ukrainian_entities())
+        return self._enabled_uk_set
     
     def get_enabled_presidio_entities(self) -> List[str]:
         """Повертає список активних Presidio сутностей."""
-        return [
-            name for name, config in self.PRESIDIO_PATTERN_ENTITIES.items() 
-            if config.enabled
-        ]
+        if self._enabled_presidio_cache is None:
+            self._enabled_presidio_cache = [
+                name for name, config in self.PRESIDIO_PATTERN_ENTITIES.items() 
+                if config.enabled
+            ]
+        return list(self._enabled_presidio_cache)
     
     def update_entity_state(self, entity_type: str, enabled: bool) -> None:
         """Оновлює стан активності сутності."""
@@ -81,6 +133,10 @@ class AppConfig:
             self.UKRAINIAN_ENTITIES[entity_type].enabled = enabled
         elif entity_type in self.PRESIDIO_PATTERN_ENTITIES:
             self.PRESIDIO_PATTERN_ENTITIES[entity_type].enabled = enabled
+        
+        self._enabled_uk_cache = None
+        self._enabled_uk_set = None
+        self._enabled_presidio_cache = None
     
     def get_all_enabled_entities(self) -> List[str]:
         """Повертає всі активні сутності (NER + Presidio)."""
@@ -5,12 +5,27 @@ Strategic Purpose: Centralize version-specific workarounds and provide
 abstraction over external library breaking changes.
 """
 
+import functools
 import sys
 import logging
 from typing import Optional
 
+from packaging.version import InvalidVersion, Version
+
 logger = logging.getLogger(__name__)
 
+# Мінімальна рекомендована версія Gradio (див. requirements.txt)
+MIN_GRADIO_VERSION = Version("4.26.0")
+
+
+@functools.lru_cache(maxsize=8)
+def parse_version(version: str) -> Optional[Version]:
+    """PEP 440 розбір рядка версії; None для нестандартних рядків."""
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
+
 
 class GradioCompatibility:
     """
@@ -20,6 +35,7 @@ class GradioCompatibility:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def has_download_button() -> bool:
         """Check if current Gradio version supports DownloadButton."""
         try:
@@ -29,6 +45,7 @@ class GradioCompatibility:
             return False
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_version() -> Optional[str]:
         """Get installed Gradio version."""
         try:
@@ -50,17 +67,13 @@ class GradioCompatibility:
         if version is None:
             raise RuntimeError("Gradio not installed")
         
-        # Example: Enforce minimum version
-        if version < "4.26.0":
+        # Порівняння версій, а не рядків: "10.0.0" < "4.26.0" як str
+        parsed = parse_version(version)
+        if parsed is None:
+            logger.warning(f"Cannot parse Gradio version '{version}'")
+        elif parsed < MIN_GRADIO_VERSION:
             logger.warning(
                 f"Gradio {version} detected. "
-                f"Recommended: 4.26.0 for stability"
+                f"Recommended: {MIN_GRADIO_VERSION} for stability"
             )
 
-
-# Run validation on import
-try:
-    GradioCompatibility.validate_compatibility()
-except Exception as e:
-    logger.error(f"Dependency validation failed: {e}")
-    # Don't crash - allow app to attempt startup
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Реєстр важких об'єктів процесу: spaCy пайплайн, Presidio Anonymizer, HybridAnalyzer.
+
+Архітектурний принцип: кожен важкий об'єкт створюється рівно один раз
+на процес і далі передається за посиланням. Warmup, UI та recognizers
+отримують ті самі екземпляри, тому ваги моделі ніколи не дублюються в пам'яті.
+
+Імпорти spaCy, huggingface_hub та Presidio виконуються всередині getter-ів:
+модуль можна імпортувати на старті без секунд затримки, а важкі бібліотеки
+завантажуються вже у фоновому warmup.
+
+Thread-safety: warmup виконується у фоновому потоці паралельно з UI,
+тому кожен getter серіалізований власним lock - об'єкт не буде
+створено двічі, навіть якщо запит прийде до завершення warmup.
+"""
+
+import functools
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from core.config import config
+
+if TYPE_CHECKING:
+    # Тільки для анотацій: під час виконання ці модулі імпортуються
+    # всередині getter-ів (core.analyzer ще й імпортує цей модуль)
+    import spacy
+    from presidio_anonymizer import AnonymizerEngine
+    from core.analyzer import HybridAnalyzer
+
+# Телеметрія HF Hub - зайві HTTP запити на старті; змінна читається
+# huggingface_hub під час імпорту, тому виставляємо її до нього
+os.environ.setdefault("HF_HUB_DISABLE_TELEMETRY", "1")
+
+logger = logging.getLogger(__name__)
+
+# Компоненти пайплайна, потрібні для NER
+_NER_PIPES = ("transformer", "ner")
+
+
+def _synchronized(func):
+    """Серіалізує виклики lru_cache-функції власним lock."""
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with lock:
+            return func(*args, **kwargs)
+
+    wrapper.cache_clear = func.cache_clear
+    return wrapper
+
+
+def _resolve_model_dir(repo_id: str) -> str:
+    """
+    Повертає локальний шлях до snapshot моделі.
+
+    Warm start: якщо модель вже є в кеші HF, повертаємо її без очікування
+    мережі; перевірка нової ревізії йде у фоновому потоці. Синхронне
+    завантаження - тільки при першому запуску.
+    """
+    from huggingface_hub import snapshot_download
+    from huggingface_hub.utils import LocalEntryNotFoundError
+    
+    try:
+        local_dir = snapshot_download(repo_id=repo_id, local_files_only=True)
+    except LocalEntryNotFoundError:
+        logger.info("Model %s not found in local cache, downloading", repo_id)
+        return snapshot_download(repo_id=repo_id)
+    
+    # Stale-while-revalidate: стартуємо з кешу, а нову ревізію (якщо є)
+    # підтягуємо у фоні - вона знадобиться після наступного рестарту
+    threading.Thread(
+        target=_revalidate_snapshot,
+        args=(repo_id,),
+        name="model-revalidate",
+        daemon=True
+    ).start()
+    return local_dir
+
+
+def _revalidate_snapshot(repo_id: str) -> None:
+    """Оновлює кеш HF до останньої ревізії; помилки мережі не критичні."""
+    from huggingface_hub import snapshot_download
+    
+    try:
+        snapshot_download(repo_id=repo_id)
+    except Exception as e:
+        logger.info("Background revalidation of %s skipped: %s", repo_id, e)
+
+
+def _select_device(device: str) -> None:
+    """
+    Обирає пристрій для spaCy до spacy.load.
+    
+    spaCy-transformers розміщує torch модель на пристрої поточних thinc ops,
+    тому вибір має відбутися до завантаження пайплайна.
+    
+    Raises:
+        ValueError: Невідоме значення NER_DEVICE
+    """
+    import spacy
+    
+    if device == "cpu":
+        return
+    if device == "cuda":
+        # Без GPU (або cupy) - явна помилка замість тихого CPU
+        spacy.require_gpu()
+        logger.info("NER model pinned to GPU")
+    elif device == "auto":
+        if spacy.prefer_gpu():
+            logger.info("GPU available, NER model will run on CUDA")
+    else:
+        raise ValueError(
+            f"Unknown NER_DEVICE '{device}'. Available: ['auto', 'cuda', 'cpu']"
+        )
+
+
+def _hf_shim(nlp):
+    """Повертає PyTorchShim, що тримає HF модель компонента transformer."""
+    return nlp.get_pipe("transformer").model.layers[0].shims[0]
+
+
+def _outputs_to_float32(module, inputs, output):
+    """
+    Forward hook: повертає виходи трансформера у float32.
+    
+    spaCy-transformers конвертує тензори в numpy, а numpy не має bfloat16;
+    далі по пайплайну (ner) також очікується float32.
+    """
+    import torch
+    
+    for key, value in output.items():
+        if torch.is_tensor(value) and value.is_floating_point():
+            output[key] = value.float()
+        elif isinstance(value, tuple):
+            output[key] = tuple(
+                item.float() if torch.is_tensor(item) and item.is_floating_point() else item
+                for item in value
+            )
+    return output
+
+
+def _apply_precision(nlp, precision: str) -> None:
+    """
+    Переводить ваги трансформера у bf16/fp16 або int8.
+    
+    Продуктивність: вдвічі менший трафік пам'яті для ваг - forward pass
+    трансформера memory-bound, тож це пряма економія латентності.
+    Матмули йдуть у зниженій точності, а виходи хук повертає у float32.
+    
+    int8 (тільки CPU): динамічна квантизація nn.Linear - ваги int8,
+    активації квантуються на льоту, виходи лишаються float32.
+    """
+    import torch
+    
+    dtypes = {"bf16": torch.bfloat16, "fp16": torch.float16}
+    if precision == "fp32":
+        return
+    if precision not in (*dtypes, "int8"):
+        raise ValueError(
+            f"Unknown NER_PRECISION '{precision}'. "
+            f"Available: {['fp32', *dtypes, 'int8']}"
+        )
+    
+    transformer = _hf_shim(nlp)._model
+    device = next(transformer.parameters()).device
+    if precision == "int8":
+        if device.type != "cpu":
+            logger.warning("int8 dynamic quantization requires CPU, keeping fp32 weights")
+            return
+        # inplace: shim та spaCy-transformers тримають посилання на цей модуль
+        torch.ao.quantization.quantize_dynamic(
+            transformer,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+            inplace=True
+        )
+        logger.info("NER transformer Linear layers quantized to int8")
+        return
+    if precision == "fp16" and device.type != "cuda":
+        logger.warning("fp16 inference requires GPU, keeping fp32 weights")
+        return
+    
+    transformer.to(dtypes[precision])
+    transformer.register_forward_hook(_outputs_to_float32)
+    logger.info("NER transformer weights cast to %s", precision)
+
+
+def _use_onnx_backend(nlp, model_dir: str) -> None:
+    """
+    Переводить трансформер на ONNX Runtime; при будь-якій помилці
+    лишається PyTorch - сервіс не повинен падати через оптимізацію.
+    """
+    try:
+        from core.onnx_backend import use_onnx_backend
+        
+        use_onnx_backend(_hf_shim(nlp), model_dir, config.NER_PRECISION)
+    except ImportError as e:
+        logger.warning("ONNX backend unavailable (%s), using PyTorch", e)
+    except Exception as e:
+        logger.error("ONNX backend setup failed, using PyTorch: %s", e, exc_info=True)
+
+
+@_synchronized
+@functools.lru_cache(maxsize=1)
+def get_nlp() -> "spacy.language.Language":
+    """
+    Повертає єдиний на процес spaCy пайплайн української NER моделі.
+
+    Raises:
+        Exception: Помилки завантаження пробрасуються як є - кеш не
+            заповнюється, тож наступний виклик повторить спробу.
+    """
+    import spacy
+    
+    logger.info("Loading Ukrainian NER model: %s", config.MODEL_REPO)
+    local_model_dir = _resolve_model_dir(config.MODEL_REPO)
+    _select_device(config.NER_DEVICE)
+    nlp = spacy.load(local_model_dir)
+    
+    # Аналізу потрібні тільки doc.ents: решта компонентів (tagger, parser,
+    # lemmatizer...) лише додає роботу на кожен токен
+    for name in nlp.pipe_names:
+        if name not in _NER_PIPES:
+            nlp.disable_pipe(name)
+    
+    if config.NER_BACKEND == "onnx":
+        _use_onnx_backend(nlp, local_model_dir)
+    else:
+        _apply_precision(nlp, config.NER_PRECISION)
+    
+    logger.info("Model loaded successfully, active pipes: %s", nlp.pipe_names)
+    return nlp
+
+
+@_synchronized
+@functools.lru_cache(maxsize=1)
+def get_anonymizer() -> "AnonymizerEngine":
+    """Повертає єдиний на процес Presidio AnonymizerEngine."""
+    from presidio_anonymizer import AnonymizerEngine
+    
+    return AnonymizerEngine()
+
+
+@_synchronized
+@functools.lru_cache(maxsize=1)
+def get_analyzer() -> "HybridAnalyzer":
+    """
+    Повертає єдиний на процес HybridAnalyzer.
+
+    Імпорт всередині функції: core.analyzer сам залежить від цього модуля.
+    """
+    from core.analyzer import HybridAnalyzer
+
+    return HybridAnalyzer()
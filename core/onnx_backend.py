@@ -0,0 +1,190 @@
+"""
+ONNX Runtime backend для трансформера української NER моделі.
+
+Архітектурна стратегія: spaCy пайплайн лишається без змін (токенізація,
+вирівнювання wordpieces, NER голова), підміняється тільки HF модель
+всередині компонента transformer - на адаптер над onnxruntime.InferenceSession.
+ORT зливає LayerNorm/GELU/attention у fused kernels і прибирає Python
+overhead eager PyTorch.
+
+Експорт виконується один раз і кешується на диску за SHA snapshot моделі.
+"""
+
+import copy
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import torch
+from transformers.modeling_outputs import BaseModelOutput
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+# Порядок входів ONNX графа (підмножина, яку приймає токенізатор)
+_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+_OUTPUT_NAME = "last_hidden_state"
+
+
+class _LastHiddenState(torch.nn.Module):
+    """Обгортка для експорту: граф повертає тільки last_hidden_state."""
+
+    def __init__(self, transformer: torch.nn.Module, input_names: List[str]):
+        super().__init__()
+        self.transformer = transformer
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        kwargs = dict(zip(self.input_names, inputs))
+        return self.transformer(**kwargs).last_hidden_state
+
+
+class OnnxTransformer(torch.nn.Module):
+    """
+    Адаптер InferenceSession з інтерфейсом HF моделі для spaCy-transformers.
+
+    spaCy-transformers викликає модель з input_ids/attention_mask
+    (і token_type_ids, якщо є) та читає з результату last_hidden_state.
+    """
+
+    def __init__(self, session, hf_config):
+        super().__init__()
+        self.session = session
+        self.config = hf_config
+        self._input_names = [node.name for node in session.get_inputs()]
+
+    @property
+    def device(self) -> torch.device:
+        return torch.device("cpu")
+
+    def forward(self, input_ids, attention_mask, token_type_ids=None, **kwargs):
+        if token_type_ids is None:
+            token_type_ids = torch.zeros_like(input_ids)
+
+        tensors = {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": token_type_ids,
+        }
+        feeds = {
+            name: tensors[name].cpu().numpy().astype(np.int64, copy=False)
+            for name in self._input_names
+        }
+
+        (hidden,) = self.session.run([_OUTPUT_NAME], feeds)
+        return BaseModelOutput(last_hidden_state=torch.from_numpy(hidden))
+
+
+def onnx_cache_path(model_dir: str, precision: str = "fp32") -> Path:
+    """
+    Шлях до ONNX файлу для snapshot моделі.
+
+    Ім'я каталогу snapshot у кеші HF - це SHA ревізії, тож нова версія
+    моделі автоматично отримує новий експорт.
+    """
+    cache_dir = Path(os.path.expanduser(config.NER_ONNX_CACHE_DIR))
+    filename = "model.onnx" if precision == "fp32" else f"model.{precision}.onnx"
+    return cache_dir / Path(model_dir).name / filename
+
+
+def export_onnx(transformer: torch.nn.Module, tokenizer, path: Path) -> None:
+    """
+    Експортує HF трансформер у ONNX з динамічними batch/sequence осями.
+
+    Експортується копія моделі: TorchScript exporter під час трасування
+    може змінити буфери оригіналу, а він лишається fallback-ом.
+    """
+    input_names = [name for name in _INPUT_NAMES if name in tokenizer.model_input_names]
+    sample = tokenizer(["Іван Петренко", "Київ"], padding=True, return_tensors="pt")
+    dynamic_axes = {
+        name: {0: "batch", 1: "sequence"}
+        for name in (*input_names, _OUTPUT_NAME)
+    }
+
+    wrapper = _LastHiddenState(copy.deepcopy(transformer).float().eval(), input_names)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+
+    logger.info("Exporting NER transformer to ONNX: %s", path)
+    torch.onnx.export(
+        wrapper,
+        tuple(sample[name] for name in input_names),
+        str(tmp_path),
+        input_names=input_names,
+        output_names=[_OUTPUT_NAME],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+        dynamo=False
+    )
+    # Атомарна заміна: перерваний експорт не залишить битий файл у кеші
+    os.replace(tmp_path, path)
+
+
+def quantize_onnx(source: Path, path: Path) -> None:
+    """
+    Динамічна INT8 квантизація ваг MatMul/Gemm.
+
+    Продуктивність: на CPU з AVX-512 VNNI / AMX int8 dot products дають
+    кратний приріст пропускної здатності матмулів, а ваги займають
+    вчетверо менше пам'яті. Активації квантуються на льоту.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = path.with_suffix(".tmp")
+
+    logger.info("Quantizing ONNX model to int8: %s", path)
+    quantize_dynamic(
+        str(source),
+        str(tmp_path),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"]
+    )
+    os.replace(tmp_path, path)
+
+
+def use_onnx_backend(shim, model_dir: str, precision: str = "fp32") -> None:
+    """
+    Підміняє HF модель у PyTorchShim компонента transformer на ONNX Runtime.
+
+    Args:
+        shim: HFShim компонента transformer spaCy пайплайна
+        model_dir: Локальний каталог snapshot моделі (ключ кешу)
+        precision: "fp32" або "int8" (динамічна квантизація)
+
+    Raises:
+        ImportError: Якщо onnxruntime не встановлено
+        ValueError: Якщо precision не підтримується ONNX backend
+    """
+    import onnxruntime as ort
+
+    if precision not in ("fp32", "int8"):
+        raise ValueError(f"ONNX backend supports fp32 and int8, got '{precision}'")
+
+    fp32_path = onnx_cache_path(model_dir)
+    if not fp32_path.exists():
+        export_onnx(shim._model, shim._hfmodel.tokenizer, fp32_path)
+
+    path = onnx_cache_path(model_dir, precision)
+    if not path.exists():
+        quantize_onnx(fp32_path, path)
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(
+        str(path),
+        options,
+        providers=["CPUExecutionProvider"]
+    )
+
+    adapter = OnnxTransformer(session, shim._model.config)
+    shim._model = adapter
+    shim._hfmodel.transformer = adapter
+
+    logger.info(
+        "NER transformer served by ONNX Runtime: %s (providers: %s)",
+        path.name,
+        session.get_providers()
+    )
@@ -5,11 +5,30 @@
 Recognizers: NER та pattern-based detection.
 
 Архітектурна ізоляція: кожен recognizer є самодостатнім модулем.
+
+Lazy exports (PEP 562): `from recognizers import UkrainianNERRecognizer`
+працює як раніше, але модуль recognizer-а (а з ним spaCy/Presidio)
+імпортується тільки при першому зверненні до атрибута.
 """
-from recognizers.ukrainian_ner import UkrainianNERRecognizer
-from recognizers.presidio_patterns import PresidioPatternRecognizer
+import importlib
+
+_EXPORTS = {
+    "UkrainianNERRecognizer": "recognizers.ukrainian_ner",
+    "get_ukrainian_ner": "recognizers.ukrainian_ner",
+    "PresidioPatternRecognizer": "recognizers.presidio_patterns",
+    "get_pattern_recognizer": "recognizers.presidio_patterns",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    "UkrainianNERRecognizer",
-    "PresidioPatternRecognizer"
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
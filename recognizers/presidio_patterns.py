@@ -5,15 +5,32 @@ Pattern-based recognizers для PII даних (Presidio).
 language-agnostic pattern recognizers з українською контекстуалізацією.
 """
 
+import functools
 import logging
-from typing import List, Optional
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set
 
-from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer
+from presidio_analyzer import AnalyzerEngine, EntityRecognizer, Pattern, PatternRecognizer
 from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngine
+from presidio_analyzer.predefined_recognizers import SpacyRecognizer
 from presidio_analyzer import RecognizerResult
 
+from core.config import config
+
+try:
+    import hyperscan
+except ImportError:  # Опційна залежність: без неї працює чистий Presidio
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+# Кожен вбудований pattern (email, URL, IP, IBAN, картки, телефони, дати,
+# крипто-адреси) містить цифру, "@", "." або ":" - без них Presidio не
+# запускаємо взагалі. Після add_custom_recognizer перевірка вимикається:
+# кастомний recognizer може шукати і звичайні слова
+_PATTERN_HINT_RE = re.compile(r"[\d@.:]")
+
 
 class SimpleNoOpNlpEngine(NlpEngine):
     """
@@ -29,6 +46,9 @@ class SimpleNoOpNlpEngine(NlpEngine):
     def __init__(self, supported_languages: Optional[List[str]] = None):
         self._supported_languages = supported_languages or ["en"]
         self._loaded = True
+        # Порожні artifacts однакові для всіх текстів мови: pattern
+        # recognizers їх тільки читають, тож створюємо один раз на мову
+        self._empty_artifacts: Dict[str, NlpArtifacts] = {}
 
     def load(self) -> None:
         """Заглушка: нічого не завантажуємо."""
@@ -39,14 +59,17 @@ class SimpleNoOpNlpEngine(NlpEngine):
 
     def process_text(self, text: str, language: str) -> NlpArtifacts:
         """Повертає порожні artifacts - pattern recognizers не потребують NLP."""
-        return NlpArtifacts(
-            entities=[],
-            tokens=[],
-            lemmas=[],
-            tokens_indices=[],
-            nlp_engine=self,
-            language=language
-        )
+        artifacts = self._empty_artifacts.get(language)
+        if artifacts is None:
+            artifacts = self._empty_artifacts[language] = NlpArtifacts(
+                entities=[],
+                tokens=[],
+                lemmas=[],
+                tokens_indices=[],
+                nlp_engine=self,
+                language=language
+            )
+        return artifacts
 
     def process_batch(
         self, 
@@ -57,8 +80,9 @@ class SimpleNoOpNlpEngine(NlpEngine):
         **kwargs
     ):
         """Batch processing заглушка."""
+        artifacts = self.process_text("", language)
         for text in texts:
-            yield text, self.process_text(text, language)
+            yield text, artifacts
 
     def is_stopword(self, word: str, language: str) -> bool:
         return False
@@ -73,29 +97,140 @@ class SimpleNoOpNlpEngine(NlpEngine):
         return list(self._supported_languages)
 
 
+class HyperscanPrefilter:
+    """
+    Один multi-pattern прохід Hyperscan перед запуском Presidio.
+    
+    Архітектурне рішення: Presidio проганяє кожен regex окремо через
+    backtracking-движок. Ми компілюємо всі patterns у одну Hyperscan DFA
+    з HS_FLAG_PREFILTER: вона може дати хибний позитив, але ніколи не
+    пропускає справжній збіг. Тому Presidio запускається тільки для типів,
+    чиї patterns потенційно збігаються, а точні межі, score та валідація
+    (Luhn, checksum IBAN) лишаються за Presidio - результат ідентичний.
+    
+    Thread-safety: scratch space Hyperscan не можна ділити між
+    одночасними scan, тому кожен потік отримує власний клон.
+    """
+    
+    # Presidio компілює patterns з IGNORECASE | MULTILINE | DOTALL
+    _FLAGS = (
+        (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+         | hyperscan.HS_FLAG_ALLOWEMPTY | hyperscan.HS_FLAG_UTF8
+         | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_CASELESS
+         | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_DOTALL)
+        if hyperscan is not None else 0
+    )
+    
+    def __init__(self, recognizers: Iterable[EntityRecognizer]):
+        """
+        Args:
+            recognizers: Recognizers з registry Presidio. PatternRecognizer
+                потрапляють у DFA, решта (напр. PhoneRecognizer) - завжди
+                вважаються кандидатами.
+        """
+        self._pattern_entities: List[str] = []
+        self._always_entities: Set[str] = set()
+        expressions = []
+        
+        for recognizer in recognizers:
+            if isinstance(recognizer, PatternRecognizer) and recognizer.patterns:
+                for pattern in recognizer.patterns:
+                    expressions.append(pattern.regex.encode("utf-8"))
+                    self._pattern_entities.append(recognizer.supported_entities[0])
+            else:
+                self._always_entities.update(recognizer.supported_entities)
+        
+        self._database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            flags=[self._FLAGS] * len(expressions)
+        )
+        self._scratch = hyperscan.Scratch(self._database)
+        self._local = threading.local()
+        
+        logger.info("Hyperscan prefilter compiled with %d patterns", len(expressions))
+    
+    @classmethod
+    def build(cls, recognizers: Iterable[EntityRecognizer]) -> Optional['HyperscanPrefilter']:
+        """Створює prefilter або повертає None, якщо Hyperscan недоступний."""
+        if hyperscan is None:
+            logger.info("hyperscan not installed, using plain Presidio regex")
+            return None
+        
+        try:
+            return cls(recognizers)
+        except hyperscan.error as e:
+            logger.warning("Hyperscan compilation failed, prefilter disabled: %s", e)
+            return None
+    
+    def _thread_scratch(self) -> "hyperscan.Scratch":
+        """Scratch space поточного потоку (клонується при першому scan)."""
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = self._scratch.clone()
+        return scratch
+    
+    def candidate_entities(
+        self,
+        text: str,
+        requested: Optional[Iterable[str]] = None
+    ) -> Set[str]:
+        """
+        Повертає типи сутностей, які можуть бути в тексті.
+        
+        Args:
+            text: Текст для сканування
+            requested: Типи, що цікавлять викликача. Scan зупиняється,
+                щойно всі вони знайдені; None - сканувати весь текст.
+        """
+        hits: Set[str] = set(self._always_entities)
+        pattern_entities = self._pattern_entities
+        pending = None if requested is None else set(requested) - hits
+        
+        if pending is not None and not pending:
+            return hits
+        
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context) -> bool:
+            entity = pattern_entities[pattern_id]
+            hits.add(entity)
+            if pending is not None:
+                pending.discard(entity)
+                # True зупиняє scan: решта тексту вже нічого не змінить
+                return not pending
+            return False
+        
+        try:
+            self._database.scan(
+                text.encode("utf-8"),
+                match_event_handler=on_match,
+                scratch=self._thread_scratch()
+            )
+        except hyperscan.ScanTerminated:
+            pass
+        return hits
+
+
 class PresidioPatternRecognizer:
     """
     Wrapper над Presidio Analyzer з кастомними українськими recognizers.
     
     Стратегія: Централізована конфігурація всіх pattern-based recognizers
-    з можливістю легкого додавання нових patterns.
+    з можливістю легкого додавання нових patterns. Спільний екземпляр
+    процесу - get_pattern_recognizer(), щоб не дублювати AnalyzerEngine.
     """
     
-    _instance: Optional['PresidioPatternRecognizer'] = None
     _analyzer: Optional[AnalyzerEngine] = None
-    
-    def __new__(cls):
-        """Singleton для уникнення дублювання recognizers."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    _prefilter: Optional[HyperscanPrefilter] = None
+    # Registry містить тільки вбудовані recognizers (див. _PATTERN_HINT_RE)
+    _builtin_only: bool = True
+    # Зростає з кожною зміною registry: входить у ключ кешу HybridAnalyzer
+    registry_version: int = 0
     
     def __init__(self):
         """Ініціалізація з реєстрацією кастомних recognizers."""
-        if not hasattr(self, '_initialized'):
-            self._initialized = True
-            self._setup_analyzer()
-            logger.info("PresidioPatternRecognizer initialized")
+        self._setup_analyzer()
+        logger.info("PresidioPatternRecognizer initialized")
     
     def _setup_analyzer(self) -> None:
         """
@@ -113,8 +248,44 @@ class PresidioPatternRecognizer:
         # Реєструємо український IBAN recognizer
         self._register_ukrainian_iban()
         
+        self._prune_registry()
+        self._precompile_patterns()
+        self._prefilter = HyperscanPrefilter.build(self._analyzer.registry.recognizers)
+        
         logger.info("Presidio Analyzer configured with custom recognizers")
     
+    def _prune_registry(self) -> None:
+        """
+        Залишає в registry тільки recognizers для сутностей з конфігурації.
+        
+        Presidio за замовчуванням реєструє US/UK recognizers (SSN, NHS...),
+        які ми ніколи не запитуємо, а SpacyRecognizer з NoOp engine завжди
+        порожній. Менший registry - коротший цикл на кожен запит.
+        """
+        wanted = set(config.PRESIDIO_PATTERN_ENTITIES)
+        registry = self._analyzer.registry
+        
+        registry.recognizers = [
+            recognizer for recognizer in registry.recognizers
+            if not isinstance(recognizer, SpacyRecognizer)
+            and wanted.intersection(recognizer.supported_entities)
+        ]
+        
+        logger.info("Presidio registry pruned to %d recognizers", len(registry.recognizers))
+    
+    def _precompile_patterns(self) -> None:
+        """
+        Прогрів: один прогін analyze компілює regex усіх PatternRecognizer.
+        
+        Presidio компілює patterns ліниво при першому analyze, тож без
+        прогріву ця ціна падала б на перший запит користувача.
+        """
+        self._analyzer.analyze(
+            text="warmup",
+            entities=list(config.PRESIDIO_PATTERN_ENTITIES),
+            language="en"
+        )
+    
     def _register_ukrainian_iban(self) -> None:
         """
         Реєструє recognizer для українських IBAN кодів.
@@ -167,23 +338,91 @@ class PresidioPatternRecognizer:
         Raises:
             ValueError: Якщо text порожній
         """
-        if not text or not text.strip():
-            raise ValueError("Текст не може бути порожнім")
+        self._validate_text(text)
         
         try:
-            results = self._analyzer.analyze(
-                text=text,
-                entities=enabled_entities,
-                language=language
-            )
-            
-            logger.info(f"Found {len(results)} pattern-based entities")
+            results = self._analyze_text(text, self._requested(enabled_entities), language)
+            logger.info("Found %d pattern-based entities", len(results))
             return results
             
         except Exception as e:
-            logger.error(f"Error during pattern analysis: {e}")
+            logger.error("Error during pattern analysis: %s", e)
+            raise RuntimeError(f"Помилка pattern detection: {e}") from e
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        enabled_entities: Optional[List[str]] = None,
+        language: str = "en"
+    ) -> List[List[RecognizerResult]]:
+        """
+        Аналізує кілька текстів, симетрично до UkrainianNERRecognizer.analyze_batch.
+        
+        Presidio не має батчевого API, але перелік сутностей (і запит до
+        registry за supported_entities) резолвиться один раз на весь батч.
+        
+        Returns:
+            Список результатів у тому ж порядку, що й texts
+            
+        Raises:
+            ValueError: Якщо будь-який текст порожній
+            RuntimeError: Помилка Presidio на будь-якому тексті
+        """
+        for text in texts:
+            self._validate_text(text)
+        
+        try:
+            requested = self._requested(enabled_entities)
+            batch_results = [
+                self._analyze_text(text, requested, language) for text in texts
+            ]
+            logger.info(
+                "Found %d pattern-based entities in %d texts",
+                sum(map(len, batch_results)),
+                len(texts)
+            )
+            return batch_results
+            
+        except Exception as e:
+            logger.error("Error during pattern batch analysis: %s", e)
             raise RuntimeError(f"Помилка pattern detection: {e}") from e
     
+    @staticmethod
+    def _validate_text(text: str) -> None:
+        if not text or not text.strip():
+            raise ValueError("Текст не може бути порожнім")
+    
+    def _requested(self, enabled_entities: Optional[List[str]]) -> Optional[List[str]]:
+        """Типи для пошуку; None лишається None, якщо prefilter недоступний."""
+        if self._prefilter is None:
+            return enabled_entities
+        return enabled_entities or self.supported_entities
+    
+    def _analyze_text(
+        self,
+        text: str,
+        requested: Optional[List[str]],
+        language: str
+    ) -> List[RecognizerResult]:
+        """Prefilter + Presidio для одного валідного тексту."""
+        if self._builtin_only and not _PATTERN_HINT_RE.search(text):
+            return []
+        
+        enabled_entities = requested
+        if self._prefilter is not None:
+            candidates = self._prefilter.candidate_entities(text, requested)
+            enabled_entities = [e for e in requested if e in candidates]
+            
+            # Порожній список Presidio трактує як "всі сутності"
+            if not enabled_entities:
+                return []
+        
+        return self._analyzer.analyze(
+            text=text,
+            entities=enabled_entities,
+            language=language
+        )
+    
     @property
     def supported_entities(self) -> List[str]:
         """Повертає список підтримуваних типів сутностей."""
@@ -200,7 +439,16 @@ class PresidioPatternRecognizer:
         """
         try:
             self._analyzer.registry.add_recognizer(recognizer)
-            logger.info(f"Added custom recognizer for {recognizer.supported_entities}")
+            self._builtin_only = False
+            self.registry_version += 1
+            self._prefilter = HyperscanPrefilter.build(self._analyzer.registry.recognizers)
+            logger.info("Added custom recognizer for %s", recognizer.supported_entities)
         except Exception as e:
-            logger.error(f"Failed to add recognizer: {e}")
-            raise
\ No newline at end of file
+            logger.error("Failed to add recognizer: %s", e)
+            raise
+
+
+@functools.lru_cache(maxsize=1)
+def get_pattern_recognizer() -> PresidioPatternRecognizer:
+    """Повертає єдиний на процес PresidioPatternRecognizer."""
+    return PresidioPatternRecognizer()
@@ -5,47 +5,125 @@
 NER моделлю. Забезпечує lazy loading та обробку помилок.
 """
 
+import functools
 import logging
-from typing import List, Optional
+import re
+import sys
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
-import spacy
-from huggingface_hub import snapshot_download
-from presidio_analyzer import RecognizerResult
+# spaCy та presidio_analyzer (~4 с імпорту) підтягуються всередині методів:
+# імпорт модуля не тягне їх, поки NER реально не знадобиться
 
 from core.config import config
+from core.model_registry import get_nlp
+
+if TYPE_CHECKING:
+    # Тільки для анотацій - під час виконання не імпортуються
+    import spacy
+    from presidio_analyzer import RecognizerResult
 
 logger = logging.getLogger(__name__)
 
+# Перелік типів: list від користувача або готовий frozenset з
+# config.get_enabled_ukrainian_set(), який використовується без копіювання
+EntityTypes = Union[List[str], FrozenSet[str]]
+
+# Текст без жодної літери чи цифри (пунктуація, емодзі, символи) не може
+# містити іменованих сутностей - трансформер для нього не запускаємо
+_WORD_RE = re.compile(r"\w")
+
+# Межа речення: пробіли після кінцевого розділового знака
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+def _chunk_spans(text: str, size: int) -> List[Tuple[int, int]]:
+    """
+    Ділить текст на шматки [start, end) до size символів по межах речень.
+    
+    Речення довше за size стає окремим шматком - різати всередині
+    речення не можна, там може бути сутність.
+    """
+    if size <= 0 or len(text) <= size:
+        return [(0, len(text))]
+    
+    spans = []
+    chunk_start = last_boundary = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        boundary = match.end()
+        if boundary - chunk_start > size and last_boundary > chunk_start:
+            spans.append((chunk_start, last_boundary))
+            chunk_start = last_boundary
+        last_boundary = boundary
+    
+    if len(text) - chunk_start > size and last_boundary > chunk_start:
+        spans.append((chunk_start, last_boundary))
+        chunk_start = last_boundary
+    spans.append((chunk_start, len(text)))
+    return spans
+
+
+@functools.lru_cache(maxsize=32)
+def _label_ids(enabled_set: FrozenSet[str]) -> Dict[int, str]:
+    """
+    Хеш мітки spaCy (ent.label) -> інтернований тип сутності.
+    
+    Фільтр за int-хешем не декодує ent.label_ з StringStore для
+    вимкнених типів, а для увімкнених одразу дає готовий str.
+    """
+    from spacy.strings import hash_string
+    
+    return {hash_string(label): sys.intern(label) for label in enabled_set}
+
+
+def _confidence_getter() -> Optional[Callable]:
+    """
+    Функція читання Span._.confidence або None, якщо extension немає.
+    
+    Extension з getter викликається напряму: ent._ створює новий
+    Underscore і шукає extension у словнику на кожне звернення.
+    Extension-атрибут (default/set_extension без getter) зберігається в
+    doc.user_data, тож для нього лишається звичайний ent._.confidence.
+    """
+    from spacy.tokens import Span
+    
+    if not Span.has_extension("confidence"):
+        return None
+    
+    _default, _method, getter, _setter = Span.get_extension("confidence")
+    if getter is not None:
+        return getter
+    return lambda ent: ent._.confidence
+
+
+def _read_confidence(confidence_of: Callable, ent) -> float:
+    """Confidence сутності; некоректне значення - 1.0."""
+    try:
+        return float(confidence_of(ent))
+    except (AttributeError, ValueError, TypeError):
+        return 1.0
+
 
 class UkrainianNERRecognizer:
     """
     Recognizer для українських named entities.
     
-    Стратегія: Singleton pattern з lazy loading для оптимізації
-    використання пам'яті. Модель завантажується тільки при першому виклику.
+    Стратегія: один екземпляр на процес через get_ukrainian_ner(), lazy
+    loading для оптимізації використання пам'яті. Модель завантажується
+    тільки при першому виклику.
     """
     
-    _instance: Optional['UkrainianNERRecognizer'] = None
-    _nlp: Optional[spacy.language.Language] = None
-    
-    def __new__(cls):
-        """Singleton: тільки один екземпляр recognizer на весь застосунок."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    _nlp: Optional["spacy.language.Language"] = None
     
     def __init__(self):
         """Конструктор не завантажує модель - це робить _load_model()."""
-        if not hasattr(self, '_initialized'):
-            self._initialized = True
-            logger.info("UkrainianNERRecognizer initialized (model not loaded yet)")
+        logger.info("UkrainianNERRecognizer initialized (model not loaded yet)")
     
-    def _load_model(self) -> spacy.language.Language:
+    def _load_model(self) -> "spacy.language.Language":
         """
         Lazy loading української NER моделі.
         
-        Завантажує модель з Hugging Face Hub при першому виклику.
-        Кешує результат для подальшого використання.
+        Сам пайплайн живе в core.model_registry, тому всі споживачі
+        (warmup, HybridAnalyzer, UI) працюють з одним екземпляром.
         
         Returns:
             Завантажена spaCy модель
@@ -55,12 +133,9 @@ class UkrainianNERRecognizer:
         """
         if self._nlp is None:
             try:
-                logger.info(f"Loading Ukrainian NER model: {config.MODEL_REPO}")
-                local_model_dir = snapshot_download(repo_id=config.MODEL_REPO)
-                self._nlp = spacy.load(local_model_dir)
-                logger.info("Model loaded successfully")
+                self._nlp = get_nlp()
             except Exception as e:
-                logger.error(f"Failed to load model: {e}")
+                logger.error("Failed to load model: %s", e)
                 raise RuntimeError(f"Не вдалося завантажити модель: {e}") from e
         
         return self._nlp
@@ -68,14 +143,14 @@ class UkrainianNERRecognizer:
     def analyze(
         self, 
         text: str, 
-        enabled_entities: Optional[List[str]] = None
-    ) -> List[RecognizerResult]:
+        enabled_entities: Optional[EntityTypes] = None
+    ) -> List["RecognizerResult"]:
         """
         Аналізує текст та повертає знайдені українські сутності.
         
         Args:
             text: Текст для аналізу
-            enabled_entities: Список типів сутностей для пошуку.
+            enabled_entities: Список або frozenset типів сутностей для пошуку.
                              Якщо None - шукає всі доступні.
         
         Returns:
@@ -85,59 +160,203 @@ class UkrainianNERRecognizer:
             ValueError: Якщо text порожній
             RuntimeError: Якщо модель не завантажилась
         """
-        if not text or not text.strip():
-            raise ValueError("Текст не може бути порожнім")
+        self._validate_text(text)
         
-        if len(text) > config.MAX_TEXT_LENGTH:
-            raise ValueError(
-                f"Текст завеликий: {len(text)} символів "
-                f"(max {config.MAX_TEXT_LENGTH})"
-            )
+        if not _WORD_RE.search(text):
+            logger.info("Found 0 Ukrainian entities")
+            return []
+        
+        # Довгий текст - шматками через nlp.pipe
+        if 0 < config.NER_CHUNK_SIZE < len(text):
+            return self.analyze_batch([text], enabled_entities)[0]
         
         # Lazy loading моделі
         nlp = self._load_model()
+        enabled_set = self._enabled_set(enabled_entities)
         
-        # Якщо не вказано які сутності шукати - шукаємо всі
-        if enabled_entities is None:
-            enabled_entities = list(config.UKRAINIAN_ENTITIES.keys())
+        try:
+            # Обробка тексту моделлю
+            results = self._doc_entities(nlp(text), enabled_set)
+            
+            logger.info("Found %d Ukrainian entities", len(results))
+            return results
+            
+        except Exception as e:
+            logger.error("Error during NER analysis: %s", e)
+            raise RuntimeError(f"Помилка під час аналізу: {e}") from e
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        enabled_entities: Optional[EntityTypes] = None
+    ) -> List[List["RecognizerResult"]]:
+        """
+        Аналізує кілька текстів одним проходом nlp.pipe.
+        
+        Продуктивність: spaCy пакує тексти в батчі config.NER_BATCH_SIZE,
+        тож трансформер робить один forward pass на батч замість одного
+        на текст - накладні витрати токенізатора та torch амортизуються.
+        Тексти довші за config.NER_CHUNK_SIZE діляться по реченнях на
+        шматки; позиції сутностей перераховуються з offset шматка.
         
-        # Конвертуємо в set для швидкої перевірки
-        enabled_set = set(enabled_entities)
+        Args:
+            texts: Тексти для аналізу
+            enabled_entities: Список або frozenset типів сутностей. None - всі доступні.
+        
+        Returns:
+            Список результатів у тому ж порядку, що й texts
+            
+        Raises:
+            ValueError: Якщо будь-який текст порожній або завеликий
+            RuntimeError: Якщо модель не завантажилась
+        """
+        for text in texts:
+            self._validate_text(text)
+        
+        batch_results: List[List["RecognizerResult"]] = [[] for _ in texts]
+        
+        # У модель йдуть тільки тексти, які можуть містити сутності
+        model_indices = [i for i, text in enumerate(texts) if _WORD_RE.search(text)]
+        if not model_indices:
+            return batch_results
+        
+        # (індекс тексту, start, end) для кожного шматка з літерами/цифрами
+        chunks = [
+            (i, start, end)
+            for i in model_indices
+            for start, end in _chunk_spans(texts[i], config.NER_CHUNK_SIZE)
+            if _WORD_RE.search(texts[i], start, end)
+        ]
+        
+        nlp = self._load_model()
+        enabled_set = self._enabled_set(enabled_entities)
+        
+        # Однакові шматки (повторні тексти батчу, шаблонні абзаци документа)
+        # проходять модель один раз: текст шматка -> позиція першого входження
+        chunk_texts = [texts[i][start:end] for i, start, end in chunks]
+        first_positions: Dict[str, int] = {}
+        for pos, chunk_text in enumerate(chunk_texts):
+            first_positions.setdefault(chunk_text, pos)
         
         try:
-            # Обробка тексту моделлю
-            doc = nlp(text)
+            docs = nlp.pipe(list(first_positions), batch_size=config.NER_BATCH_SIZE)
+            unique_results = {
+                pos: self._doc_entities(doc, enabled_set, chunks[pos][1])
+                for pos, doc in zip(first_positions.values(), docs)
+            }
             
-            results = []
-            for ent in doc.ents:
-                # Пропускаємо якщо тип сутності не активований
-                if ent.label_ not in enabled_set:
-                    continue
-                
-                # Витягуємо confidence якщо доступний
-                confidence = 1.0
-                if ent.has_extension("confidence"):
-                    try:
-                        confidence = float(ent._.confidence)
-                    except (AttributeError, ValueError, TypeError):
-                        pass
-                
-                # Створюємо правильний RecognizerResult
-                result = RecognizerResult(
-                    entity_type=ent.label_,
-                    start=ent.start_char,
-                    end=ent.end_char,
-                    score=confidence
-                )
-                results.append(result)
+            for pos, (i, start, _end) in enumerate(chunks):
+                source_pos = first_positions[chunk_texts[pos]]
+                results = unique_results[source_pos]
+                if source_pos != pos:
+                    results = self._shift_results(results, start - chunks[source_pos][1])
+                batch_results[i].extend(results)
             
-            logger.info(f"Found {len(results)} Ukrainian entities")
-            return results
+            logger.info(
+                "Found %d Ukrainian entities in %d texts",
+                sum(map(len, batch_results)),
+                len(texts)
+            )
+            return batch_results
             
         except Exception as e:
-            logger.error(f"Error during NER analysis: {e}")
+            logger.error("Error during NER batch analysis: %s", e)
             raise RuntimeError(f"Помилка під час аналізу: {e}") from e
     
+    @staticmethod
+    def _validate_text(text: str) -> None:
+        """Валідація вхідного тексту."""
+        if not text or not text.strip():
+            raise ValueError("Текст не може бути порожнім")
+        
+        if len(text) > config.MAX_TEXT_LENGTH:
+            raise ValueError(
+                f"Текст завеликий: {len(text)} символів "
+                f"(max {config.MAX_TEXT_LENGTH})"
+            )
+    
+    @staticmethod
+    def _enabled_set(enabled_entities: Optional[EntityTypes]) -> FrozenSet[str]:
+        """Якщо не вказано які сутності шукати - шукаємо всі."""
+        if enabled_entities is None:
+            enabled_entities = config.UKRAINIAN_ENTITIES.keys()
+        elif isinstance(enabled_entities, frozenset):
+            # config.get_enabled_ukrainian_set() - вже готовий незмінний set
+            return enabled_entities
+        
+        # frozenset: ключ кешу _label_ids без копіювання
+        return frozenset(enabled_entities)
+    
+    @staticmethod
+    def _doc_entities(
+        doc,
+        enabled_set: set,
+        offset: int = 0
+    ) -> List["RecognizerResult"]:
+        """
+        Конвертує сутності spaCy Doc у RecognizerResult (координати вихідного тексту).
+        
+        Args:
+            offset: Позиція Doc у вихідному тексті (для шматків)
+        """
+        from presidio_analyzer import RecognizerResult
+        
+        # Extension реєструється на класі Span - резолвимо один раз,
+        # а не для кожної сутності
+        confidence_of = _confidence_getter()
+        
+        label_ids = _label_ids(frozenset(enabled_set))
+        
+        # Пропускаємо сутності, тип яких не активований
+        entities = [
+            (entity_type, ent)
+            for ent in doc.ents
+            if (entity_type := label_ids.get(ent.label)) is not None
+        ]
+        
+        # Тип інтернований у _label_ids: подальші dict lookups
+        # (operators, color map) стають identity-перевіркою
+        if confidence_of is None:
+            results = [
+                RecognizerResult(
+                    entity_type=entity_type,
+                    start=ent.start_char + offset,
+                    end=ent.end_char + offset,
+                    score=1.0
+                )
+                for entity_type, ent in entities
+            ]
+        else:
+            results = [
+                RecognizerResult(
+                    entity_type=entity_type,
+                    start=ent.start_char + offset,
+                    end=ent.end_char + offset,
+                    score=_read_confidence(confidence_of, ent)
+                )
+                for entity_type, ent in entities
+            ]
+        
+        return results
+    
+    @staticmethod
+    def _shift_results(
+        results: List["RecognizerResult"],
+        delta: int
+    ) -> List["RecognizerResult"]:
+        """Копії сутностей повторного шматка, зсунуті на delta символів."""
+        from presidio_analyzer import RecognizerResult
+        
+        return [
+            RecognizerResult(
+                entity_type=result.entity_type,
+                start=result.start + delta,
+                end=result.end + delta,
+                score=result.score
+            )
+            for result in results
+        ]
+    
     @property
     def is_loaded(self) -> bool:
         """Перевіряє чи модель завантажена."""
@@ -147,4 +366,11 @@ class UkrainianNERRecognizer:
         """Вивантажує модель з пам'яті (для економії ресурсів)."""
         if self._nlp is not None:
             logger.info("Unloading Ukrainian NER model")
-            self._nlp = None
\ No newline at end of file
+            self._nlp = None
+            get_nlp.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def get_ukrainian_ner() -> UkrainianNERRecognizer:
+    """Повертає єдиний на процес UkrainianNERRecognizer."""
+    return UkrainianNERRecognizer()
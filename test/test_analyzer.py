@@ -198,6 +198,150 @@ class TestHybridAnalyzer:
             result = analyzer.analyze("Тестовий текст")
             assert isinstance(result, AnalysisResult)
 
+    # ============ ТЕСТИ БАТЧЕВОГО АНАЛІЗУ ============
+
+    @patch('recognizers.ukrainian_ner.UkrainianNERRecognizer.analyze_batch')
+    @patch('recognizers.presidio_patterns.PresidioPatternRecognizer.analyze_batch')
+    def test_analyze_batch_matches_per_text(self, mock_presidio_batch, mock_ner_batch, analyzer):
+        """Тест: батч повертає результат для кожного тексту в порядку входу."""
+        # Arrange
+        texts = ["Іван працює", "Без сутностей"]
+        mock_ner_batch.return_value = [
+            [RecognizerResult(entity_type="PERS", start=0, end=4, score=0.95)],
+            []
+        ]
+        mock_presidio_batch.return_value = [[], []]
+
+        # Act
+        results = analyzer.analyze_batch(texts)
+
+        # Assert: NER та patterns викликано один раз на весь батч
+        mock_ner_batch.assert_called_once()
+        mock_presidio_batch.assert_called_once()
+        assert [r.original_text for r in results] == texts
+        assert results[0].anonymized_text == "[PERS] працює"
+        assert results[1].entities_count == 0
+
+    @patch('recognizers.ukrainian_ner.UkrainianNERRecognizer.analyze_batch')
+    @patch('recognizers.presidio_patterns.PresidioPatternRecognizer.analyze')
+    @patch('recognizers.presidio_patterns.PresidioPatternRecognizer.analyze_batch')
+    def test_analyze_batch_pattern_fallback_per_text(
+        self, mock_presidio_batch, mock_presidio, mock_ner_batch, analyzer
+    ):
+        """Тест: помилка pattern batch - повтор поштучно, збій одного тексту не кешується."""
+        # Arrange
+        texts = ["Пишіть на a@b.com", "Без сутностей"]
+        mock_ner_batch.return_value = [[], []]
+        mock_presidio_batch.side_effect = RuntimeError("batch failed")
+        mock_presidio.side_effect = [
+            [RecognizerResult(entity_type="EMAIL_ADDRESS", start=10, end=17, score=1.0)],
+            RuntimeError("pattern failed")
+        ]
+
+        # Act
+        results = analyzer.analyze_batch(texts)
+
+        # Assert
+        assert mock_presidio.call_count == 2
+        assert results[0].anonymized_text == "Пишіть на [EMAIL_ADDRESS]"
+        assert results[1].entities_count == 0
+        assert analyzer.get_system_info()["analysis_cache_size"] == 1
+
+    def test_operators_cached_for_unknown_types(self, analyzer):
+        """Тест: operator для невідомого типу створюється один раз."""
+        results = [
+            RecognizerResult(entity_type="PERS", start=0, end=4, score=0.9),
+            RecognizerResult(entity_type="CUSTOM_ID", start=5, end=9, score=0.9)
+        ]
+
+        first = analyzer.operators_for(results)
+        second = analyzer.operators_for(results)
+
+        assert set(first) == {"PERS", "CUSTOM_ID"}
+        assert second["CUSTOM_ID"] is first["CUSTOM_ID"]
+
+    def test_operators_follow_anonymization_format(self, analyzer, monkeypatch):
+        """Тест: зміна формату анонімізації перебудовує закешовані operators."""
+        results = [RecognizerResult(entity_type="PERS", start=0, end=4, score=0.9)]
+        analyzer.operators_for(results)
+        
+        monkeypatch.setattr(config, "DEFAULT_ANONYMIZATION_FORMAT", "<{entity_type}>")
+        
+        operator = analyzer.operators_for(results)["PERS"]
+        assert operator.params["new_value"] == "<PERS>"
+
+    def test_pattern_executor_shared(self, analyzer):
+        """Тест: екземпляри HybridAnalyzer не створюють власних пулів потоків."""
+        assert HybridAnalyzer()._pattern_executor is analyzer._pattern_executor
+
+    def test_sanitize_keeps_valid_and_clamps_invalid(self, analyzer):
+        """Тест: коректні сутності не копіюються, некоректні обрізаються."""
+        valid = RecognizerResult(entity_type="PERS", start=0, end=4, score=0.9)
+        overflow = RecognizerResult(entity_type="LOC", start=5, end=50, score=0.9)
+        empty = RecognizerResult(entity_type="ORG", start=8, end=8, score=0.9)
+
+        assert analyzer._sanitize_results("Іван Київ", [valid])[0] is valid
+
+        sanitized = analyzer._sanitize_results("Іван Київ", [valid, overflow, empty])
+        assert sanitized[0] is valid
+        assert (sanitized[1].start, sanitized[1].end) == (5, 9)
+        assert len(sanitized) == 2
+
+    # ============ ТЕСТИ КЕШУ ============
+
+    @patch('recognizers.ukrainian_ner.UkrainianNERRecognizer.analyze')
+    @patch('recognizers.presidio_patterns.PresidioPatternRecognizer.analyze')
+    def test_repeated_text_served_from_cache(self, mock_presidio, mock_ner, analyzer):
+        """Тест: повторний текст не проходить recognizers вдруге."""
+        # Arrange
+        mock_ner.return_value = [
+            RecognizerResult(entity_type="PERS", start=0, end=4, score=0.95)
+        ]
+        mock_presidio.return_value = []
+
+        # Act
+        first = analyzer.analyze("Іван працює")
+        second = analyzer.analyze("Іван працює")
+
+        # Assert
+        assert mock_ner.call_count == 1
+        assert second.anonymized_text == first.anonymized_text
+        info = analyzer.get_system_info()
+        assert info["analysis_cache_hits"] == 1
+        assert info["analysis_cache_misses"] == 1
+
+    def test_cache_invalidated_by_custom_recognizer(self, analyzer):
+        """Тест: після add_custom_recognizer результат не береться з кешу."""
+        from presidio_analyzer import PatternRecognizer
+        from recognizers.presidio_patterns import PresidioPatternRecognizer
+        
+        # Власний recognizer: спільний екземпляр процесу не змінюємо
+        analyzer.pattern_recognizer = PresidioPatternRecognizer()
+        text = "Операція Сокира почалась вчора"
+        
+        before = analyzer.analyze(text, ukrainian_entities=[], presidio_entities=["CODENAME"])
+        analyzer.add_custom_recognizer(PatternRecognizer(
+            supported_entity="CODENAME",
+            deny_list=["Сокира"],
+            supported_language="en"
+        ))
+        after = analyzer.analyze(text, ukrainian_entities=[], presidio_entities=["CODENAME"])
+        
+        assert before.entities_count == 0
+        assert after.anonymized_text == "Операція [CODENAME] почалась вчора"
+
+    @patch('recognizers.ukrainian_ner.UkrainianNERRecognizer.analyze')
+    @patch('recognizers.presidio_patterns.PresidioPatternRecognizer.analyze')
+    def test_failed_analysis_not_cached(self, mock_presidio, mock_ner, analyzer):
+        """Тест: неповний результат (помилка NER) не потрапляє в кеш."""
+        mock_ner.side_effect = RuntimeError("NER failed")
+        mock_presidio.return_value = []
+
+        analyzer.analyze("Тестовий текст")
+        analyzer.analyze("Тестовий текст")
+
+        assert mock_ner.call_count == 2
+
 
 class TestAnalysisResult:
     """Тести для AnalysisResult dataclass."""
@@ -232,6 +376,437 @@ class TestAnalysisResult:
         assert "не знайдено" in formatted.lower()
 
 
+class TestConflictResolution:
+    """Тести для розв'язання конфліктів між сутностями."""
+    
+    @staticmethod
+    def _brute_force(ranked):
+        """Еталон: повний скан прийнятих сутностей."""
+        filtered = []
+        for r in ranked:
+            if all(r.end <= e.start or r.start >= e.end for e in filtered):
+                filtered.append(r)
+        return filtered
+    
+    def test_score_resolver_keeps_highest_score(self):
+        """Тест: з перетинаючихся сутностей лишається та, що має вищий score."""
+        from utils.conflict_resolution import remove_overlapping_entities
+        
+        results = [
+            RecognizerResult(entity_type="PERS", start=0, end=10, score=0.7),
+            RecognizerResult(entity_type="ORG", start=5, end=15, score=0.9),
+            RecognizerResult(entity_type="LOC", start=15, end=20, score=0.5),
+        ]
+        
+        resolved = remove_overlapping_entities(results, strategy="score")
+        
+        assert [r.entity_type for r in resolved] == ["ORG", "LOC"]
+    
+    def test_sweep_matches_brute_force(self):
+        """Тест: бінарний пошук дає той самий результат, що й повний скан."""
+        import random
+        from utils.conflict_resolution import _select_non_overlapping
+        
+        rng = random.Random(42)
+        for _ in range(50):
+            ranked = []
+            for _ in range(rng.randint(0, 60)):
+                start = rng.randint(0, 200)
+                ranked.append(RecognizerResult(
+                    entity_type="PERS",
+                    start=start,
+                    end=start + rng.randint(0, 15),
+                    score=rng.random()
+                ))
+            
+            assert _select_non_overlapping(ranked) == self._brute_force(ranked)
+    
+    def test_non_overlapping_returned_sorted(self):
+        """Тест: без перетинів усі сутності лишаються, у порядку позиції."""
+        from utils.conflict_resolution import remove_overlapping_entities
+        
+        results = [
+            RecognizerResult(entity_type="LOC", start=15, end=20, score=0.5),
+            RecognizerResult(entity_type="PERS", start=0, end=10, score=0.7),
+            RecognizerResult(entity_type="ORG", start=10, end=15, score=0.9),
+        ]
+        
+        for strategy in ("score", "priority"):
+            resolved = remove_overlapping_entities(results, strategy=strategy)
+            assert [r.entity_type for r in resolved] == ["PERS", "ORG", "LOC"]
+
+
+class TestUkrainianNERBatch:
+    """Тести для batch-аналізу NER через nlp.pipe."""
+    
+    @staticmethod
+    def _fake_doc(*ents):
+        from spacy.strings import hash_string
+        
+        doc = Mock()
+        doc.ents = [
+            Mock(label=hash_string(label), label_=label, start_char=start, end_char=end)
+            for label, start, end in ents
+        ]
+        return doc
+    
+    def test_analyze_batch_uses_single_pipe_call(self):
+        """Тест: всі тексти йдуть в один nlp.pipe, порядок зберігається."""
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        nlp = Mock()
+        nlp.pipe.return_value = iter([
+            self._fake_doc(("PERS", 0, 4)),
+            self._fake_doc(("LOC", 2, 7), ("MISC", 8, 9)),
+        ])
+        recognizer = UkrainianNERRecognizer()
+        
+        with patch.object(UkrainianNERRecognizer, "_load_model", return_value=nlp):
+            results = recognizer.analyze_batch(
+                ["Іван тут", "У Києві"],
+                enabled_entities=["PERS", "LOC"]
+            )
+        
+        nlp.pipe.assert_called_once()
+        assert [[r.entity_type for r in item] for item in results] == [["PERS"], ["LOC"]]
+    
+    def test_symbol_only_text_skips_model(self):
+        """Тест: текст без літер і цифр не запускає трансформер."""
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        with patch.object(UkrainianNERRecognizer, "_load_model") as mock_load:
+            assert UkrainianNERRecognizer().analyze("?! — ...") == []
+        
+        mock_load.assert_not_called()
+    
+    def test_analyze_batch_rejects_empty_text(self):
+        """Тест: порожній текст у батчі викликає ValueError до запуску моделі."""
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        with pytest.raises(ValueError, match="порожнім"):
+            UkrainianNERRecognizer().analyze_batch(["текст", "  "])
+    
+    def test_analyze_batch_runs_model_once_per_distinct_text(self):
+        """Тест: однакові тексти в батчі йдуть у модель один раз."""
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        nlp = Mock()
+        nlp.pipe.side_effect = lambda chunks, batch_size: (
+            self._fake_doc(("PERS", 0, 4)) for _ in chunks
+        )
+        
+        with patch.object(UkrainianNERRecognizer, "_load_model", return_value=nlp):
+            results = UkrainianNERRecognizer().analyze_batch(
+                ["Іван тут", "Іван тут", "Інший текст"],
+                enabled_entities=["PERS"]
+            )
+        
+        assert list(nlp.pipe.call_args.args[0]) == ["Іван тут", "Інший текст"]
+        assert [[(r.start, r.end) for r in item] for item in results] == [
+            [(0, 4)], [(0, 4)], [(0, 4)]
+        ]
+        assert results[0][0] is not results[1][0]
+    
+    def test_confidence_extension_getter(self):
+        """Тест: score береться з getter extension Span._.confidence."""
+        from spacy.tokens import Span
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        doc = self._fake_doc(("PERS", 0, 4))
+        Span.set_extension("confidence", getter=lambda span: 0.75)
+        try:
+            results = UkrainianNERRecognizer._doc_entities(doc, {"PERS"})
+        finally:
+            Span.remove_extension("confidence")
+        
+        assert [r.score for r in results] == [0.75]
+    
+    def test_chunk_spans_split_on_sentences(self):
+        """Тест: шматки покривають текст без пропусків і ріжуться по реченнях."""
+        from recognizers.ukrainian_ner import _chunk_spans
+        
+        text = "Перше речення тут. Друге речення тут! Третє дуже довге речення"
+        spans = _chunk_spans(text, 25)
+        
+        assert spans[0][0] == 0 and spans[-1][1] == len(text)
+        assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+        assert [text[start:end].strip() for start, end in spans] == [
+            "Перше речення тут.", "Друге речення тут!", "Третє дуже довге речення"
+        ]
+    
+    def test_long_text_chunk_offsets(self):
+        """Тест: позиції сутностей зі шматків перераховуються у вихідний текст."""
+        from recognizers.ukrainian_ner import UkrainianNERRecognizer
+        
+        sentence = "Іван Петренко живе тут. "
+        text = sentence * 3
+        
+        def pipe(chunks, batch_size):
+            for chunk in chunks:
+                ents = [
+                    ("PERS", start, start + 13)
+                    for start in range(0, len(chunk), len(sentence))
+                ]
+                yield self._fake_doc(*ents)
+        
+        nlp = Mock()
+        nlp.pipe.side_effect = pipe
+        
+        with patch.object(config, "NER_CHUNK_SIZE", len(sentence) + 1), \
+                patch.object(UkrainianNERRecognizer, "_load_model", return_value=nlp):
+            results = UkrainianNERRecognizer().analyze(text, ["PERS"])
+        
+        assert sorted((r.start, r.end) for r in results) == [
+            (0, 13), (24, 37), (48, 61)
+        ]
+    
+    def test_import_does_not_load_spacy(self):
+        """Тест: пакет recognizers і NER модуль імпортуються без spaCy/Presidio."""
+        import subprocess
+        
+        code = (
+            "import sys, recognizers, recognizers.ukrainian_ner; "
+            "assert 'spacy' not in sys.modules; "
+            "assert 'presidio_analyzer' not in sys.modules"
+        )
+        root = Path(__file__).parent.parent
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+class TestModelPrecision:
+    """Тести для переведення трансформера у знижену точність."""
+    
+    @staticmethod
+    def _fake_nlp(module):
+        shim = Mock(_model=module)
+        nlp = Mock()
+        nlp.get_pipe.return_value.model.layers = [Mock(shims=[shim])]
+        return nlp
+    
+    def test_bf16_weights_with_float32_outputs(self):
+        """Тест: ваги у bf16, а виходи трансформера лишаються float32."""
+        torch = pytest.importorskip("torch")
+        from transformers.modeling_outputs import BaseModelOutput
+        from core.model_registry import _apply_precision
+        
+        class TinyTransformer(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.linear = torch.nn.Linear(4, 4)
+            
+            def forward(self, x):
+                return BaseModelOutput(last_hidden_state=self.linear(x.to(self.linear.weight.dtype)))
+        
+        module = TinyTransformer()
+        _apply_precision(self._fake_nlp(module), "bf16")
+        output = module(torch.ones(1, 4))
+        
+        assert module.linear.weight.dtype == torch.bfloat16
+        assert output.last_hidden_state.dtype == torch.float32
+
+    def test_int8_dynamic_quantization_in_place(self):
+        """Тест: int8 квантизує Linear у тому ж модулі, що тримає shim."""
+        torch = pytest.importorskip("torch")
+        from core.model_registry import _apply_precision
+
+        module = torch.nn.Sequential(torch.nn.Linear(16, 16))
+        inputs = torch.randn(2, 16)
+        expected = module(inputs)
+
+        _apply_precision(self._fake_nlp(module), "int8")
+
+        assert isinstance(module[0], torch.ao.nn.quantized.dynamic.Linear)
+        assert torch.allclose(module(inputs), expected, atol=0.1)
+
+    def test_unknown_precision_raises_error(self):
+        """Тест: невідома точність викликає ValueError."""
+        pytest.importorskip("torch")
+        from core.model_registry import _apply_precision
+        
+        with pytest.raises(ValueError, match="NER_PRECISION"):
+            _apply_precision(Mock(), "int3")
+    
+    def test_unknown_device_rejected(self):
+        """Тест: невідомий NER_DEVICE дає зрозумілу помилку до spacy.load."""
+        from core.model_registry import _select_device
+        
+        with pytest.raises(ValueError, match="NER_DEVICE"):
+            _select_device("tpu")
+
+
+class TestModelRegistry:
+    """Тести для пошуку snapshot моделі в кеші HF."""
+    
+    def test_cached_snapshot_revalidated_in_background(self):
+        """Тест: warm start повертає кеш одразу, оновлення - у фоні."""
+        import threading
+        import core.model_registry as registry
+        
+        revalidated = threading.Event()
+        with patch("huggingface_hub.snapshot_download", return_value="/cache/model") as download, \
+                patch.object(registry, "_revalidate_snapshot",
+                             side_effect=lambda repo_id: revalidated.set()):
+            assert registry._resolve_model_dir("org/model") == "/cache/model"
+            assert revalidated.wait(timeout=5)
+        
+        download.assert_called_once_with(repo_id="org/model", local_files_only=True)
+
+
+class TestOnnxBackend:
+    """Тести для ONNX Runtime backend трансформера."""
+    
+    @staticmethod
+    def _tiny_transformer():
+        import torch
+        from transformers import XLMRobertaConfig, XLMRobertaModel
+        
+        torch.manual_seed(0)
+        hf_config = XLMRobertaConfig(
+            vocab_size=64, hidden_size=16, num_hidden_layers=1,
+            num_attention_heads=2, intermediate_size=32
+        )
+        return XLMRobertaModel(hf_config, add_pooling_layer=False).eval()
+    
+    @staticmethod
+    def _fake_tokenizer():
+        import torch
+        
+        def tokenize(texts, **kwargs):
+            return {
+                "input_ids": torch.tensor([[0, 5, 6, 2], [0, 7, 2, 1]]),
+                "attention_mask": torch.tensor([[1, 1, 1, 1], [1, 1, 1, 0]]),
+            }
+        
+        tokenizer = Mock(side_effect=tokenize)
+        tokenizer.model_input_names = ["input_ids", "attention_mask"]
+        return tokenizer
+    
+    def test_onnx_adapter_matches_pytorch(self, tmp_path, monkeypatch):
+        """Тест: ONNX адаптер дає ті самі hidden states, що й PyTorch."""
+        torch = pytest.importorskip("torch")
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+        from core.onnx_backend import use_onnx_backend
+        
+        monkeypatch.setattr(config, "NER_ONNX_CACHE_DIR", str(tmp_path))
+        transformer = self._tiny_transformer()
+        shim = Mock(_model=transformer)
+        shim._hfmodel.tokenizer = self._fake_tokenizer()
+        
+        use_onnx_backend(shim, "/hf/snapshots/abc123")
+        
+        input_ids = torch.tensor([[0, 9, 10, 11, 12, 2], [0, 13, 2, 1, 1, 1]])
+        attention_mask = torch.tensor([[1] * 6, [1, 1, 1, 0, 0, 0]])
+        with torch.no_grad():
+            expected = transformer(input_ids=input_ids, attention_mask=attention_mask)
+        actual = shim._model(input_ids=input_ids, attention_mask=attention_mask)
+        
+        assert (tmp_path / "abc123" / "model.onnx").exists()
+        assert shim._hfmodel.transformer is shim._model
+        assert torch.allclose(
+            actual.last_hidden_state, expected.last_hidden_state, atol=1e-4
+        )
+    
+    def test_int8_model_is_cached_next_to_fp32(self, tmp_path, monkeypatch):
+        """Тест: int8 квантизація будується з fp32 експорту і кешується."""
+        torch = pytest.importorskip("torch")
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+        from core.onnx_backend import use_onnx_backend
+        
+        monkeypatch.setattr(config, "NER_ONNX_CACHE_DIR", str(tmp_path))
+        shim = Mock(_model=self._tiny_transformer())
+        shim._hfmodel.tokenizer = self._fake_tokenizer()
+        
+        use_onnx_backend(shim, "/hf/snapshots/abc123", precision="int8")
+        output = shim._model(
+            input_ids=torch.tensor([[0, 9, 10, 2]]),
+            attention_mask=torch.ones(1, 4, dtype=torch.long)
+        )
+        
+        assert (tmp_path / "abc123" / "model.onnx").exists()
+        assert (tmp_path / "abc123" / "model.int8.onnx").exists()
+        assert output.last_hidden_state.shape == (1, 4, 16)
+
+
+class TestHyperscanPrefilter:
+    """Тести для Hyperscan prefilter перед Presidio."""
+    
+    @pytest.fixture
+    def recognizer(self):
+        pytest.importorskip("hyperscan")
+        from recognizers.presidio_patterns import get_pattern_recognizer
+        return get_pattern_recognizer()
+    
+    def test_prefilter_keeps_results_identical(self, recognizer):
+        """Тест: prefilter не змінює результат Presidio."""
+        text = (
+            "Email: test@example.com, IP 192.168.1.1, "
+            "IBAN UA213223130000026007233566001, картка 4111 1111 1111 1111"
+        )
+        
+        with_prefilter = recognizer.analyze(text)
+        prefilter, recognizer._prefilter = recognizer._prefilter, None
+        try:
+            without_prefilter = recognizer.analyze(text)
+        finally:
+            recognizer._prefilter = prefilter
+        
+        key = lambda r: (r.entity_type, r.start, r.end, r.score)
+        assert sorted(map(key, with_prefilter)) == sorted(map(key, without_prefilter))
+    
+    def test_prefilter_skips_absent_entity_types(self, recognizer):
+        """Тест: типи без збігів у DFA не передаються в Presidio."""
+        candidates = recognizer._prefilter.candidate_entities("Просто текст без даних")
+        
+        assert "EMAIL_ADDRESS" not in candidates
+        assert "IBAN_CODE" not in candidates
+
+    def test_prefilter_concurrent_scans(self, recognizer):
+        """Тест: одночасні scan з різних потоків не ділять scratch space."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        text = "Просто текст без даних. " * 20000 + "test@example.com"
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                recognizer._prefilter.candidate_entities,
+                [text] * 8
+            ))
+
+        assert all("EMAIL_ADDRESS" in candidates for candidates in results)
+
+    def test_analyze_batch_matches_analyze(self, recognizer):
+        """Тест: analyze_batch дає ті самі результати, що й analyze по тексту."""
+        texts = ["Пишіть на test@example.com", "Без даних", "IP 192.168.1.1"]
+        
+        batch = recognizer.analyze_batch(texts)
+        
+        key = lambda r: (r.entity_type, r.start, r.end, r.score)
+        assert [sorted(map(key, item)) for item in batch] == [
+            sorted(map(key, recognizer.analyze(text))) for text in texts
+        ]
+
+
+class TestPresidioPatternRecognizer:
+    """Тести для PresidioPatternRecognizer."""
+    
+    def test_custom_letters_only_recognizer(self):
+        """Тест: кастомний recognizer без цифр/символів не відсікається pre-check."""
+        from presidio_analyzer import PatternRecognizer
+        from recognizers.presidio_patterns import PresidioPatternRecognizer
+        
+        recognizer = PresidioPatternRecognizer()
+        recognizer.add_custom_recognizer(PatternRecognizer(
+            supported_entity="CODENAME",
+            deny_list=["Сокира"],
+            supported_language="en"
+        ))
+        
+        results = recognizer.analyze("Операція Сокира почалась вчора", ["CODENAME"])
+        
+        assert [(r.entity_type, r.start, r.end) for r in results] == [("CODENAME", 9, 15)]
+
+
 class TestConfigIntegration:
     """Інтеграційні тести з конфігурацією."""
     
@@ -258,6 +833,25 @@ class TestConfigIntegration:
         finally:
             # Cleanup: завжди відновлюємо стан
             config.update_entity_state("PERS", original_state)
+    
+    def test_enabled_entities_cache_invalidated(self):
+        """Тест: кеш активних сутностей скидається при update_entity_state."""
+        original_state = config.PRESIDIO_PATTERN_ENTITIES["EMAIL_ADDRESS"].enabled
+        
+        try:
+            cached = config.get_enabled_ukrainian_set()
+            assert config.get_enabled_ukrainian_set() is cached
+            
+            # Повернута копія не псує кеш
+            config.get_enabled_presidio_entities().clear()
+            assert config.get_enabled_presidio_entities()
+            
+            config.update_entity_state("EMAIL_ADDRESS", False)
+            assert "EMAIL_ADDRESS" not in config.get_enabled_presidio_entities()
+            assert config.get_enabled_ukrainian_set() is not cached
+        
+        finally:
+            config.update_entity_state("EMAIL_ADDRESS", original_state)
 
 
 # ============ ІНТЕГРАЦІЙНІ ТЕСТИ (ПОТРЕБУЮТЬ МОДЕЛІ) ============
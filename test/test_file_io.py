@@ -32,7 +32,7 @@ from presidio_analyzer import RecognizerResult
 
 # ============ FIXTURES ============
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_txt_content():
     """Sample Ukrainian text."""
     return "Іван Петренко працює в ТОВ 'Приват'.\nEmail: ivan@example.com"
@@ -60,9 +60,14 @@ def sample_docx_file(tmp_path):
     return docx_file
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_analysis_result():
-    """Creates sample AnalysisResult for export tests."""
+    """
+    Creates sample AnalysisResult for export tests.
+    
+    Module scope: AnalysisResult frozen, експортери лише читають сутності;
+    тести, яким потрібен інший текст, роблять dataclasses.replace.
+    """
     entities = [
         RecognizerResult(
             entity_type="PERS",
@@ -89,6 +94,20 @@ def sample_analysis_result():
     )
 
 
+@pytest.fixture(scope="session")
+def large_txt_file(tmp_path_factory):
+    """
+    Creates ~7MB UTF-8 TXT file once per session.
+    
+    Байти кодуються один раз і пишуться write_bytes - генерація файлу
+    не змішується з виміром часу читання.
+    """
+    large_file = tmp_path_factory.mktemp("perf") / "large.txt"
+    content = "Тестовий текст з українськими символами.\n" * 100_000
+    large_file.write_bytes(content.encode('utf-8'))
+    return large_file
+
+
 # ============ FILE HANDLERS TESTS ============
 
 class TestFileHandler:
@@ -116,6 +135,40 @@ class TestFileHandler:
         # Encoding може бути auto-detected або cp1251
         assert result.encoding in ['cp1251', 'windows-1251']
     
+    def test_read_txt_universal_newlines(self, tmp_path):
+        """Test: CRLF/CR перетворюються на LF, як при читанні в text mode."""
+        txt_file = tmp_path / "test_crlf.txt"
+        txt_file.write_bytes("Рядок 1\r\nРядок 2\rРядок 3".encode('utf-8'))
+        
+        result = FileHandler.read_file(str(txt_file))
+        
+        assert result.text == "Рядок 1\nРядок 2\nРядок 3"
+    
+    def test_auto_gc_after_large_read(self, sample_docx_file, monkeypatch):
+        """Test: gc.collect() викликається лише з увімкненим порогом."""
+        import gc
+        
+        calls = []
+        monkeypatch.setattr(gc, "collect", lambda *args: calls.append(args) or 0)
+        
+        FileHandler.read_file(str(sample_docx_file))
+        assert calls == []
+        
+        monkeypatch.setattr(FileHandler, "AUTO_GC_THRESHOLD_BYTES", 0)
+        FileHandler.read_file(str(sample_docx_file))
+        assert len(calls) == 1
+    
+    @pytest.mark.parametrize("encoding", ['utf-8-sig', 'utf-16', 'utf-32'])
+    def test_read_txt_with_bom(self, tmp_path, encoding):
+        """Test: файл з BOM декодується без детектора, BOM не потрапляє в текст."""
+        txt_file = tmp_path / f"test_{encoding}.txt"
+        txt_file.write_bytes("Іван Петренко, Київ".encode(encoding))
+        
+        result = FileHandler.read_file(str(txt_file))
+        
+        assert result.text == "Іван Петренко, Київ"
+        assert result.encoding == encoding
+    
     def test_read_docx(self, sample_docx_file):
         """Test: читання DOCX файлу."""
         result = FileHandler.read_file(str(sample_docx_file))
@@ -124,6 +177,27 @@ class TestFileHandler:
         assert "Іван Петренко" in result.text
         assert "ivan@example.com" in result.text
     
+    def test_read_docx_streaming_matches_python_docx(self, tmp_path):
+        """Test: потокове читання DOCX дає ті самі параграфи, що й python-docx."""
+        from docx import Document
+        from docx.enum.text import WD_BREAK
+        
+        docx_file = tmp_path / "streaming.docx"
+        doc = Document()
+        doc.add_paragraph("Іван Петренко\tКиїв")
+        run = doc.add_paragraph("Рядок 1").add_run("Рядок 2")
+        run.add_break()
+        run.add_break(WD_BREAK.PAGE)
+        doc.add_table(rows=1, cols=1).cell(0, 0).text = "Текст у таблиці"
+        doc.add_paragraph("")
+        doc.add_paragraph("Email: ivan@example.com")
+        doc.save(docx_file)
+        
+        streamed = list(FileHandler._iter_docx_paragraphs(docx_file))
+        
+        assert streamed == [p.text for p in Document(docx_file).paragraphs]
+        assert "Текст у таблиці" not in streamed
+    
     def test_unsupported_format_raises_error(self, tmp_path):
         """Test: непідтримуваний формат викликає помилку."""
         pdf_file = tmp_path / "test.pdf"
@@ -216,6 +290,29 @@ class TestFileExporter:
         # Перевіряємо що це валідний DOCX (ZIP archive)
         assert result_bytes[:2] == b'PK'  # ZIP signature
     
+    def test_export_anonymized_text_docx_readable(self, sample_analysis_result):
+        """Test: DOCX без python-docx відкривається python-docx з тим самим текстом."""
+        from io import BytesIO
+        from docx import Document
+        
+        from dataclasses import replace
+        
+        result = replace(
+            sample_analysis_result,
+            anonymized_text="Рядок 1 & <тег>\nРядок\t2"
+        )
+        result_bytes = FileExporter.export_anonymized_text(
+            result,
+            format=ExportFormat.DOCX
+        )
+        
+        doc = Document(BytesIO(result_bytes))
+        paragraphs = doc.paragraphs
+        assert paragraphs[0].text == 'Анонімізований документ'
+        assert paragraphs[0].style.name == 'Heading 1'
+        assert "Дата обробки:" in paragraphs[1].text
+        assert paragraphs[-1].text == "Рядок 1 & <тег>\nРядок\t2"
+    
     def test_export_entities_json(self, sample_analysis_result):
         """Test: експорт сутностей в JSON."""
         result_bytes = FileExporter.export_entities_report(
@@ -253,16 +350,43 @@ class TestFileExporter:
         # Валідний DOCX
         assert result_bytes[:2] == b'PK'
         
-        # Можна додатково парсити та перевіряти вміст
-        from docx import Document
-        from io import BytesIO
+        # Вміст перевіряємо прямо в word/document.xml - без побудови
+        # об'єктної моделі python-docx
+        import zipfile
         
-        doc = Document(BytesIO(result_bytes))
-        text = "\n".join(p.text for p in doc.paragraphs)
+        with zipfile.ZipFile(BytesIO(result_bytes)) as zf:
+            text = zf.read('word/document.xml').decode('utf-8')
         
         assert "Звіт про деідентифікацію" in text
         assert "Метадані" in text
     
+    def test_export_full_report_docx_text_runs(self, sample_analysis_result):
+        """Test: анонімізований текст у звіті збігається з python-docx add_paragraph."""
+        from dataclasses import replace
+        from docx import Document
+        from io import BytesIO
+        
+        anonymized = " [PERS]\tживе у Києві.  \nДругий рядок\r\n"
+        result_bytes = FileExporter.export_full_report(
+            replace(sample_analysis_result, anonymized_text=anonymized),
+            format=ExportFormat.DOCX
+        )
+        
+        expected = Document().add_paragraph(anonymized).text
+        paragraphs = [p.text for p in Document(BytesIO(result_bytes)).paragraphs]
+        assert expected in paragraphs
+    
+    def test_import_does_not_load_docx(self):
+        """Test: file_handlers та file_exporters імпортуються без python-docx."""
+        import subprocess
+        
+        code = (
+            "import sys, utils.file_handlers, utils.file_exporters; "
+            "assert 'docx' not in sys.modules"
+        )
+        root = Path(__file__).parent.parent
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+    
     def test_export_markdown(self, sample_analysis_result):
         """Test: експорт в Markdown."""
         result_bytes = FileExporter.export_anonymized_text(
@@ -351,24 +475,26 @@ class TestFileIOIntegration:
 # ВИДАЛІТИ benchmark параметри з performance tests
 
 @pytest.mark.slow
+@pytest.mark.xdist_group(name="perf")
 class TestPerformance:
     """
     Performance tests для великих файлів.
     
     Design Philosophy: Simple timing assertions замість benchmark fixtures.
     Sufficient для smoke testing performance, extensible для production monitoring.
+    
+    З pytest-xdist (--dist=loadgroup) весь клас виконується на одному
+    worker послідовно - timing assertions не конкурують між собою за CPU.
     """
     
-    def test_large_txt_file_performance(self, tmp_path):
+    def test_large_txt_file_performance(self, large_txt_file):
         """
         Test: читання великого TXT файлу виконується за прийнятний час.
         
         Performance Baseline: 10MB файл має читатись < 2 секунди.
         """
-        # Arrange: Створюємо 10MB файл
-        large_file = tmp_path / "large.txt"
-        content = "Тестовий текст з українськими символами.\n" * 100_000
-        large_file.write_text(content, encoding='utf-8')
+        # Arrange: файл створює session fixture
+        large_file = large_txt_file
         
         file_size_mb = large_file.stat().st_size / (1024 * 1024)
         logger.info(f"Test file size: {file_size_mb:.2f} MB")
@@ -430,10 +556,13 @@ class TestPerformance:
         import psutil
         import os as os_module  # ✅ Renamed to avoid conflict
         
-        # Arrange: 50MB файл
+        # Arrange: 50MB файл пишемо блоками по 1MB - сам тест не тримає
+        # в пам'яті 50MB str/bytes, які спотворили б baseline
         huge_file = tmp_path / "huge.txt"
-        content = "X" * (50 * 1024 * 1024)
-        huge_file.write_text(content, encoding='utf-8')
+        chunk = b"X" * (1024 * 1024)
+        with open(huge_file, 'wb') as f:
+            for _ in range(50):
+                f.write(chunk)
         
         # Measure baseline memory
         process = psutil.Process(os_module.getpid())
@@ -446,10 +575,10 @@ class TestPerformance:
         peak_memory = process.memory_info().rss / (1024 * 1024)
         memory_increase = peak_memory - baseline_memory
         
-        # Assert: Memory increase reasonable (< 2x file size)
-        assert memory_increase < 100, (
+        # Assert: лишається тільки результуючий str (файл декодується з mmap)
+        assert memory_increase < 60, (
             f"Memory increased by {memory_increase:.1f}MB for 50MB file, "
-            f"expected < 100MB"
+            f"expected < 60MB"
         )
         
         logger.info(
@@ -15,15 +15,19 @@ ENHANCED VERSION: Додано підтримку завантаження фа
 та експорту результатів у різних форматах.
 """
 
+import asyncio
 import logging
 import os
 import socket
-from typing import Dict, List, Tuple, Optional
+from collections import defaultdict
+from operator import attrgetter
+from typing import DefaultDict, List, Tuple, Optional
 
 import gradio as gr
 
 from core.config import config
-from core.analyzer import HybridAnalyzer, AnalysisResult
+from core.analyzer import AnalysisResult
+from core.model_registry import get_analyzer
 
 # NEW: File I/O imports
 from utils.file_handlers import FileHandler, FileReadResult, sanitize_text
@@ -31,6 +35,20 @@ from utils.file_exporters import FileExporter, ExportFormat, generate_filename
 
 logger = logging.getLogger(__name__)
 
+_by_start = attrgetter("start")
+_span_fields = attrgetter("start", "end", "score")
+
+# Скільки одночасних запитів аналізу Gradio зливає в один виклик
+ANALYZE_MAX_BATCH_SIZE = 8
+
+# Підказки для типових помилок: (фрагмент повідомлення, підказка);
+# перший збіг виграє, як і в попередньому ланцюжку if/elif
+_ERROR_HINTS = (
+    ("порожній", "💡 Введіть текст для аналізу"),
+    ("завеликий", "💡 Максимальний розмір: {max_length} символів"),
+    ("модель", "💡 Спробуйте перезавантажити сторінку"),
+)
+
 
 class GradioInterface:
     """
@@ -43,14 +61,42 @@ class GradioInterface:
     від core business logic.
     """
     
+    # Одночасні події черги Gradio (за замовчуванням Gradio виконує по
+    # одній - довгий NER запит блокує всіх); env: GRADIO_CONCURRENCY_LIMIT
+    CONCURRENCY_LIMIT = 2
+    # Максимальна довжина черги (решта отримує "queue full");
+    # env: GRADIO_QUEUE_MAX_SIZE
+    QUEUE_MAX_SIZE = 32
+    # Стандартний порт HF Spaces / Gradio
+    DEFAULT_SERVER_PORT = 7860
+    
     def __init__(self):
         """Ініціалізація з глобальною конфігурацією."""
-        self.analyzer = HybridAnalyzer()
+        self.analyzer = get_analyzer()
         self.config = config
 
         # Початковий стан: всі сутності активовані
         self.enabled_ukrainian = set(self.config.UKRAINIAN_ENTITIES.keys())
         self.enabled_presidio = set(self.config.PRESIDIO_PATTERN_ENTITIES.keys())
+        
+        # Варіанти CheckboxGroup: (label, value) - формуються один раз
+        self._ukrainian_choices = tuple(
+            (f"{key} - {cfg.description}", key)
+            for key, cfg in self.config.UKRAINIAN_ENTITIES.items()
+        )
+        self._presidio_choices = tuple(
+            (f"{key} - {cfg.description}", key)
+            for key, cfg in self.config.PRESIDIO_PATTERN_ENTITIES.items()
+        )
+        # Опис за типом сутності: один словник замість двох перевірок;
+        # українські типи мають пріоритет, як і раніше
+        self._desc_by_type = {
+            key: cfg.description
+            for key, cfg in {
+                **self.config.PRESIDIO_PATTERN_ENTITIES,
+                **self.config.UKRAINIAN_ENTITIES,
+            }.items()
+        }
 
         # Gradio 4.14.0 не має DownloadButton, тому використовуємо fallback
         self._has_download_button = hasattr(gr, "DownloadButton")
@@ -73,18 +119,38 @@ class GradioInterface:
         Returns:
             Tuple з повідомленнями для обох панелей виводу
         """
-        error_message = f"❌ Помилка: {str(error)}"
+        message = str(error)
+        error_message = f"❌ Помилка: {message}"
         
         # Додаємо підказки для типових помилок
-        if "порожній" in str(error).lower():
-            error_message += "\n\n💡 Введіть текст для аналізу"
-        elif "завеликий" in str(error).lower():
-            error_message += f"\n\n💡 Максимальний розмір: {config.MAX_TEXT_LENGTH} символів"
-        elif "модель" in str(error).lower():
-            error_message += "\n\n💡 Спробуйте перезавантажити сторінку"
+        lowered = message.lower()
+        for needle, hint in _ERROR_HINTS:
+            if needle in lowered:
+                error_message += "\n\n" + hint.format(max_length=config.MAX_TEXT_LENGTH)
+                break
         
         return error_message, ""
     
+    def _check_input(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Дешева перевірка вводу до виклику analyzer.
+        
+        Продуктивність: порожній або завеликий текст відсікається тут,
+        без ValueError з analyzer та логування traceback.
+        
+        Returns:
+            Tuple з повідомленнями для обох панелей або None, якщо текст валідний
+        """
+        if not text or not text.strip():
+            return "⚠️ Введіть текст для аналізу", ""
+        if len(text) > config.MAX_TEXT_LENGTH:
+            return (
+                f"❌ Текст завеликий: {len(text)} символів\n\n"
+                f"💡 Максимальний розмір: {config.MAX_TEXT_LENGTH} символів",
+                ""
+            )
+        return None
+    
     # ============================================================
     # CORE ANALYSIS METHODS (ORIGINAL + ENHANCED)
     # ============================================================
@@ -107,6 +173,10 @@ class GradioInterface:
         Returns:
             Tuple: (formatted_entities, anonymized_text)
         """
+        input_error = self._check_input(text)
+        if input_error is not None:
+            return input_error
+        
         try:
             # Перевірка чи є активні сутності
             if not self.enabled_ukrainian and not self.enabled_presidio:
@@ -133,6 +203,64 @@ class GradioInterface:
             logger.error(f"Analysis failed: {e}", exc_info=True)
             return self._format_error(e)
     
+    async def analyze_texts_batch(self, texts: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Batch handler для Gradio (batch=True): тексти одночасних запитів.
+        
+        Продуктивність: один HybridAnalyzer.analyze_batch - один батчевий
+        forward pass трансформера замість окремого на кожного користувача.
+        Результати потрапляють в LRU кеш analyzer, тож наступний
+        analysis_result_for_state для того ж тексту не повторює NER.
+        
+        Coroutine: CPU-bound аналіз виконується в потоці, event loop
+        лишається вільним для подій інших сесій.
+        
+        Args:
+            texts: Тексти від користувачів (по одному на запит)
+            
+        Returns:
+            Tuple: (entities_displays, anonymized_texts) - паралельні списки
+        """
+        return await asyncio.to_thread(self._analyze_texts, texts)
+    
+    def _analyze_texts(self, texts: List[str]) -> Tuple[List[str], List[str]]:
+        """Синхронна частина analyze_texts_batch."""
+        if not self.enabled_ukrainian and not self.enabled_presidio:
+            outputs = [self.analyze_text(text) for text in texts]
+        elif any(self._check_input(text) is not None for text in texts):
+            # Невалідний ввід не повинен валити батч інших користувачів
+            outputs = [self.analyze_text(text) for text in texts]
+        else:
+            try:
+                results = self.analyzer.analyze_batch(
+                    texts,
+                    ukrainian_entities=list(self.enabled_ukrainian),
+                    presidio_entities=list(self.enabled_presidio),
+                    conflict_strategy="priority"
+                )
+                outputs = [
+                    (self._format_entities_display(result), result.anonymized_text)
+                    for result in results
+                ]
+            except Exception as e:
+                # Некоректний текст одного запиту валить увесь батч -
+                # повторюємо поштучно, щоб помилку отримав лише його автор
+                logger.warning(f"Batch analysis failed, retrying per text: {e}")
+                outputs = [self.analyze_text(text) for text in texts]
+        
+        return [display for display, _ in outputs], [anonymized for _, anonymized in outputs]
+    
+    async def analysis_result_for_state(self, text: str) -> Optional[AnalysisResult]:
+        """
+        AnalysisResult для gr.State після батчевого аналізу.
+        
+        Батчеві події Gradio виконуються в сесії першого запиту батчу,
+        тому gr.State заповнюється окремим не-батчевим кроком; для щойно
+        проаналізованого тексту це cache hit в analyzer.
+        """
+        _, _, result = await asyncio.to_thread(self.analyze_text_with_export, text)
+        return result
+    
     def analyze_text_with_export(
         self, 
         text: str
@@ -153,6 +281,10 @@ class GradioInterface:
         Returns:
             Tuple: (entities_display, anonymized_text, result_object)
         """
+        input_error = self._check_input(text)
+        if input_error is not None:
+            return input_error[0], input_error[1], None
+        
         try:
             # Перевірка чи є активні сутності
             if not self.enabled_ukrainian and not self.enabled_presidio:
@@ -207,31 +339,23 @@ class GradioInterface:
         )
         
         # Групуємо за типами
-        entities_by_type: Dict[str, List] = {}
+        entities_by_type: DefaultDict[str, List] = defaultdict(list)
         for entity in result.entities:
-            if entity.entity_type not in entities_by_type:
-                entities_by_type[entity.entity_type] = []
             entities_by_type[entity.entity_type].append(entity)
         
-        # Форматуємо кожну групу
-        sections = []
-        for entity_type, entities in sorted(entities_by_type.items()):
-            # Отримуємо опис типу з конфігу
-            description = self._get_entity_description(entity_type)
-            
-            section_header = f"📌 {entity_type} ({description})"
-            section_items = []
-            
-            for idx, entity in enumerate(sorted(entities, key=lambda x: x.start), 1):
-                entity_text = result.original_text[entity.start:entity.end]
-                item = (
-                    f"   {idx}. '{entity_text}' "
-                    f"[позиція {entity.start}:{entity.end}, "
-                    f"впевненість {entity.score:.0%}]"
-                )
-                section_items.append(item)
-            
-            sections.append(section_header + "\n" + "\n".join(section_items))
+        # Форматуємо кожну групу: рядки секції - один join над генератором,
+        # поля сутності дістає один attrgetter
+        original_text = result.original_text
+        sections = [
+            f"📌 {entity_type} ({self._get_entity_description(entity_type)})\n"
+            + "\n".join(
+                f"   {idx}. '{original_text[start:end]}' "
+                f"[позиція {start}:{end}, впевненість {score:.0%}]"
+                for idx, (start, end, score)
+                in enumerate(map(_span_fields, sorted(entities, key=_by_start)), 1)
+            )
+            for entity_type, entities in sorted(entities_by_type.items())
+        ]
         
         return header + "\n\n".join(sections)
     
@@ -245,11 +369,7 @@ class GradioInterface:
         Returns:
             Опис сутності
         """
-        if entity_type in self.config.UKRAINIAN_ENTITIES:
-            return self.config.UKRAINIAN_ENTITIES[entity_type].description
-        elif entity_type in self.config.PRESIDIO_PATTERN_ENTITIES:
-            return self.config.PRESIDIO_PATTERN_ENTITIES[entity_type].description
-        return "Невідомий тип"
+        return self._desc_by_type.get(entity_type, "Невідомий тип")
 
     def _download_response(self, file_path: Optional[str]):
         """
@@ -476,7 +596,7 @@ class GradioInterface:
     # SETTINGS MANAGEMENT (ORIGINAL - UNCHANGED)
     # ============================================================
     
-    def update_settings(
+    async def update_settings(
         self,
         ukrainian_checkboxes: List[str],
         presidio_checkboxes: List[str]
@@ -492,6 +612,9 @@ class GradioInterface:
             
         Returns:
             Повідомлення про успішне оновлення
+        
+        Coroutine без await: швидка мутація стану виконується прямо в event
+        loop, без передачі в threadpool.
         """
         self.enabled_ukrainian = set(ukrainian_checkboxes)
         self.enabled_presidio = set(presidio_checkboxes)
@@ -777,11 +900,18 @@ class GradioInterface:
                     outputs=[input_text, file_status]
                 )
                 
-                # Text analysis (ENHANCED: зберігає результат в state)
+                # Text analysis: одночасні запити зливаються в батч; результат
+                # для export зберігається в state окремим (не-батчевим) кроком
                 analyze_btn.click(
-                    fn=self.analyze_text_with_export,
+                    fn=self.analyze_texts_batch,
                     inputs=[input_text],
-                    outputs=[entities_output, anonymized_output, analysis_result_state]
+                    outputs=[entities_output, anonymized_output],
+                    batch=True,
+                    max_batch_size=ANALYZE_MAX_BATCH_SIZE
+                ).then(
+                    fn=self.analysis_result_for_state,
+                    inputs=[input_text],
+                    outputs=[analysis_result_state]
                 )
                 
                 # Export handlers
@@ -824,10 +954,7 @@ class GradioInterface:
                         )
                         
                         ukrainian_checks = gr.CheckboxGroup(
-                            choices=[
-                                (f"{key} - {cfg.description}", key)
-                                for key, cfg in self.config.UKRAINIAN_ENTITIES.items()
-                            ],
+                            choices=list(self._ukrainian_choices),
                             value=list(self.enabled_ukrainian),
                             label="Виберіть типи сутностей",
                             elem_classes="entity-checkbox"
@@ -842,10 +969,7 @@ class GradioInterface:
                         )
                         
                         presidio_checks = gr.CheckboxGroup(
-                            choices=[
-                                (f"{key} - {cfg.description}", key)
-                                for key, cfg in self.config.PRESIDIO_PATTERN_ENTITIES.items()
-                            ],
+                            choices=list(self._presidio_choices),
                             value=list(self.enabled_presidio),
                             label="Виберіть типи шаблонів",
                             elem_classes="entity-checkbox"
@@ -893,13 +1017,35 @@ class GradioInterface:
     # LAUNCH INFRASTRUCTURE (ORIGINAL - UNCHANGED)
     # ============================================================
     
-    def launch(self, **kwargs) -> None:
+    def launch(
+        self,
+        concurrency_limit: Optional[int] = None,
+        queue_max_size: Optional[int] = None,
+        **kwargs
+    ) -> None:
         interface = self.build_interface()
 
+        # Черга: явні аргументи > змінні оточення > константи класу
+        if concurrency_limit is None:
+            concurrency_limit = int(
+                os.getenv("GRADIO_CONCURRENCY_LIMIT", self.CONCURRENCY_LIMIT)
+            )
+        if queue_max_size is None:
+            queue_max_size = int(os.getenv("GRADIO_QUEUE_MAX_SIZE", self.QUEUE_MAX_SIZE))
+        interface.queue(
+            default_concurrency_limit=concurrency_limit,
+            max_size=queue_max_size
+        )
+        logger.info(
+            "Queue: concurrency limit %s, max size %s",
+            concurrency_limit,
+            queue_max_size,
+        )
+
         defaults = {
             "share": False,
             "server_name": "0.0.0.0",  # Необхідно для Docker/HF Spaces
-            "server_port": 7860,        # Стандартний порт для HF Spaces
+            "server_port": self.DEFAULT_SERVER_PORT,
             "show_error": True,
         }
 
@@ -962,49 +1108,42 @@ class GradioInterface:
         if requested_port is not None:
             candidates.append(int(requested_port))
 
-        default_start = 7860
-        default_range = range(default_start, default_start + 10)
-        for port in default_range:
-            candidates.append(port)
+        if not candidates:
+            candidates.append(self.DEFAULT_SERVER_PORT)
+        candidates = list(dict.fromkeys(candidates))
 
-        candidates.append(None)  # Дозволяємо Gradio самостійно обрати порт
-
-        seen = set()
-        unique_candidates = []
-        for candidate in candidates:
-            if candidate not in seen:
-                unique_candidates.append(candidate)
-                seen.add(candidate)
+        normalized_host = host or "127.0.0.1"
+        # Один сокет на всі спроби: невдалий bind лишає сокет незв'язаним,
+        # тож його можна використати для наступного кандидата. SO_REUSEADDR -
+        # як і в uvicorn, щоб порт у TIME_WAIT після рестарту вважався вільним
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            for candidate in candidates:
+                if _try_bind(sock, normalized_host, candidate):
+                    return candidate
 
-        for candidate in unique_candidates:
-            if candidate is None:
-                logger.warning(
-                    "Не вдалося знайти вільний порт у діапазоні, передаємо управління Gradio"
-                )
+            # Замість перебору діапазону - один bind на порт 0: ядро саме
+            # видає вільний порт
+            if not _try_bind(sock, normalized_host, 0):
+                logger.warning("Не вдалося отримати вільний порт, передаємо управління Gradio")
                 return None
+            leased_port = sock.getsockname()[1]
 
-            if self._is_port_available(host, candidate):
-                if requested_port is not None and candidate != requested_port:
-                    logger.warning(
-                        "Порт %s зайнятий. Використовуємо %s",
-                        requested_port,
-                        candidate,
-                    )
-                return candidate
+        logger.warning(
+            "Порт %s зайнятий. Використовуємо %s",
+            ", ".join(map(str, candidates)),
+            leased_port,
+        )
+        return leased_port
 
-        raise RuntimeError("Не знайдено вільного порту для запуску Gradio")
 
-    @staticmethod
-    def _is_port_available(host: str, port: int) -> bool:
-        """Перевіряє, чи вільний вказаний порт."""
-        normalized_host = host or "127.0.0.1"
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            try:
-                sock.bind((normalized_host, port))
-            except OSError:
-                return False
-        return True
+def _try_bind(sock: socket.socket, host: str, port: int) -> bool:
+    """Пробує прив'язати сокет до порту; False, якщо порт зайнятий."""
+    try:
+        sock.bind((host, port))
+    except OSError:
+        return False
+    return True
 
 
 def create_interface() -> GradioInterface:
@@ -12,18 +12,25 @@ Design Pattern: Two-Stage Workflow
 Extensibility: Foundation for future custom JS components
 """
 
+import asyncio
 import logging
+import threading
+from collections import Counter
+from operator import attrgetter
 from typing import List, Tuple, Dict, Optional
 import gradio as gr
 from dataclasses import dataclass
 
 from core.analyzer import HybridAnalyzer, AnalysisResult
+from core.config import DATACLASS_SLOTS
 from presidio_analyzer import RecognizerResult
 
 logger = logging.getLogger(__name__)
 
+_by_start = attrgetter("start")
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class EntityReviewItem:
     """
     Structured representation для review UI
@@ -61,8 +68,24 @@ class InteractiveReviewUI:
     
     DEFAULT_COLOR = "#B0E0E6"  # Powder blue
     
-    def __init__(self, analyzer: HybridAnalyzer):
+    # Скільки перший запит чекає на фоновий warmup моделі (секунди)
+    WARMUP_TIMEOUT = 120
+    
+    # Одночасні detect запити: forward pass-и ділять ті самі CPU ядра,
+    # більше паралельних запитів лише збільшує пікову пам'ять
+    DETECT_CONCURRENCY = 4
+    # Максимальна довжина черги Gradio (решта отримує "queue full")
+    QUEUE_MAX_SIZE = 32
+    # Скільки секунд сесія тримає знайдені сутності після detect
+    STATE_TTL = 3600
+    
+    def __init__(
+        self,
+        analyzer: HybridAnalyzer,
+        ready_event: Optional[threading.Event] = None
+    ):
         self.analyzer = analyzer
+        self.ready_event = ready_event
     
     def build_interface(self) -> gr.Blocks:
         """
@@ -93,8 +116,13 @@ class InteractiveReviewUI:
             )
             
             # === STATE MANAGEMENT ===
-            detected_entities_state = gr.State([])  # List[RecognizerResult]
-            review_items_state = gr.State([])       # List[EntityReviewItem]
+            # gr.State зберігається на сервері і тримає посилання на ті самі
+            # RecognizerResult, що й кеш analyzer; TTL звільняє пам'ять
+            # довгих сесій, які не закрили вкладку
+            detected_entities_state = gr.State(
+                [],  # List[RecognizerResult]
+                time_to_live=self.STATE_TTL
+            )
             
             # === STEP 1: INPUT ===
             with gr.Group():
@@ -105,11 +133,19 @@ class InteractiveReviewUI:
                     lines=8
                 )
                 
-                detect_btn = gr.Button(
-                    "🔎 Знайти сутності",
-                    variant="primary",
-                    size="lg"
-                )
+                with gr.Row():
+                    detect_btn = gr.Button(
+                        "🔎 Знайти сутності",
+                        variant="primary",
+                        size="lg"
+                    )
+                    
+                    # Fast path: detect + анонімізація всіх сутностей за один запит
+                    quick_anonymize_btn = gr.Button(
+                        "🚀 Швидка анонімізація",
+                        variant="secondary",
+                        size="lg"
+                    )
             
             # === STEP 2: REVIEW ===
             with gr.Group(visible=False) as review_section:
@@ -172,17 +208,40 @@ class InteractiveReviewUI:
             # === EVENT HANDLERS ===
             
             # Detection workflow
+            # Спершу легкі оновлення (checklist, статистика), потім окремою
+            # подією - важкий HighlightedText: для довгого документа це
+            # тисячі фрагментів, і користувач не чекає на їх рендер
             detect_btn.click(
                 fn=self.detect_entities,
                 inputs=[input_text],
                 outputs=[
-                    highlighted_display,
                     entities_checklist,
                     detection_stats,
                     review_section,
-                    detected_entities_state,
-                    review_items_state
-                ]
+                    detected_entities_state
+                ],
+                concurrency_limit=self.DETECT_CONCURRENCY,
+                show_progress="minimal",
+                trigger_mode="once"
+            ).then(
+                fn=self.render_highlights,
+                inputs=[input_text, detected_entities_state],
+                outputs=[highlighted_display],
+                show_progress="hidden"
+            )
+            
+            # Quick workflow: без кроку перегляду
+            quick_anonymize_btn.click(
+                fn=self.anonymize_all,
+                inputs=[input_text],
+                outputs=[
+                    original_output,
+                    anonymized_output,
+                    anonymization_summary,
+                    result_section,
+                    review_section
+                ],
+                concurrency_limit=self.DETECT_CONCURRENCY
             )
             
             # Anonymization workflow
@@ -212,9 +271,13 @@ class InteractiveReviewUI:
                 cache_examples=False
             )
         
-        return interface
+        # Легкі обробники (anonymize) не обмежуються; detect має власний ліміт
+        return interface.queue(
+            default_concurrency_limit=None,
+            max_size=self.QUEUE_MAX_SIZE
+        )
     
-    def detect_entities(
+    async def detect_entities(
         self,
         text: str
     ) -> Tuple:
@@ -226,35 +289,35 @@ class InteractiveReviewUI:
         """
         if not text or not text.strip():
             return (
-                [],  # highlighted_display
                 gr.update(choices=[], value=[]),  # checklist
                 "⚠️ Введіть текст для аналізу",  # stats
                 gr.update(visible=False),  # review_section
-                [],  # entities_state
-                []   # review_items_state
+                []   # entities_state
             )
         
         try:
-            # Виконуємо аналіз
-            result: AnalysisResult = self.analyzer.analyze(text)
+            await self._wait_for_warmup()
+            
+            # Виконуємо аналіз (Gradio await-ить coroutine напряму)
+            result: AnalysisResult = await self.analyzer.analyze_async(text)
             
             if result.entities_count == 0:
                 return (
-                    [(text, None)],
                     gr.update(choices=[], value=[]),
                     "✅ Персональних даних не знайдено",
                     gr.update(visible=False),
-                    [],
                     []
                 )
             
-            # Prepare highlighted text
-            highlighted_data = self._build_highlighted_data(text, result.entities)
+            # Сортуємо один раз: індекси checklist, entities_state та
+            # підсвітка (render_highlights) спираються на той самий порядок.
+            # Analyzer вже повертає сутності за start, тож Timsort лінійний
+            entities = sorted(result.entities, key=_by_start)
             
             # Prepare checklist with detailed info
             checklist_data, review_items = self._build_checklist_data(
                 text, 
-                result.entities
+                entities
             )
             
             # Stats
@@ -264,28 +327,83 @@ class InteractiveReviewUI:
             default_selection = [item.index for item in review_items]
             
             return (
-                highlighted_data,
                 gr.update(
                     choices=checklist_data,
                     value=default_selection
                 ),
                 stats,
                 gr.update(visible=True),
-                result.entities,
-                review_items
+                entities
             )
             
         except Exception as e:
             logger.error(f"Detection failed: {e}", exc_info=True)
             return (
-                [],
                 gr.update(choices=[], value=[]),
                 f"❌ Помилка: {str(e)}",
                 gr.update(visible=False),
-                [],
                 []
             )
     
+    def render_highlights(
+        self,
+        text: str,
+        entities: List[RecognizerResult]
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Stage 1b: підсвітка сутностей (ланцюжок .then() після detect)
+        
+        entities - вже відсортований detected_entities_state.
+        """
+        if not text or not entities:
+            return []
+        return self._build_highlighted_data(text, entities)
+    
+    async def anonymize_all(self, text: str) -> Tuple:
+        """
+        Fast path: detect і анонімізація всіх сутностей одним запитом.
+        
+        Типовий сценарій - користувач не знімає жодної галочки; тоді
+        AnalysisResult вже містить анонімізований текст і другий
+        round-trip (anonymize_btn) не потрібен.
+        """
+        if not text or not text.strip():
+            return (
+                "",
+                "",
+                "⚠️ Введіть текст для аналізу",
+                gr.update(visible=True),
+                gr.update(visible=False)
+            )
+        
+        try:
+            await self._wait_for_warmup()
+            result: AnalysisResult = await self.analyzer.analyze_async(text)
+            
+            summary = self._format_anonymization_summary(
+                result.entities_count,
+                result.entities_count,
+                result.entities
+            )
+            
+            return (
+                text,
+                result.anonymized_text,
+                summary,
+                gr.update(visible=True),
+                gr.update(visible=False)
+            )
+            
+        except Exception as e:
+            logger.error(f"Quick anonymization failed: {e}", exc_info=True)
+            return (
+                text,
+                "",
+                f"❌ Помилка: {str(e)}",
+                gr.update(visible=True),
+                gr.update(visible=False)
+            )
+    
     def selective_anonymize(
         self,
         original_text: str,
@@ -315,11 +433,8 @@ class InteractiveReviewUI:
                 all_entities[idx] for idx in selected_indices
             ]
             
-            # Створюємо operators
-            operators = {
-                entity.entity_type: self.analyzer._create_operator(entity.entity_type)
-                for entity in confirmed_entities
-            }
+            # Operators з кешу analyzer (будуються один раз на тип)
+            operators = self.analyzer.operators_for(confirmed_entities)
             
             # Анонімізуємо
             anonymized = self.analyzer._anonymize(
@@ -353,6 +468,17 @@ class InteractiveReviewUI:
     
     # === HELPER METHODS ===
     
+    async def _wait_for_warmup(self) -> None:
+        """
+        Чекає на фоновий warmup; після таймауту модель довантажиться lazy.
+        
+        Очікування у worker потоці - event loop не блокується.
+        """
+        if self.ready_event is not None and not await asyncio.to_thread(
+            self.ready_event.wait, self.WARMUP_TIMEOUT
+        ):
+            logger.warning("Model warmup still in progress, analyzing anyway")
+    
     def _build_highlighted_data(
         self,
         text: str,
@@ -361,21 +487,20 @@ class InteractiveReviewUI:
         """
         Formats data for gr.HighlightedText
         
+        Expects entities sorted by start (see detect_entities).
+        
         Returns list of (text_chunk, entity_label) tuples
         """
-        sorted_entities = sorted(entities, key=lambda x: x.start)
-        
         highlighted = []
         last_pos = 0
         
-        for entity in sorted_entities:
+        for entity in entities:
             # Text before entity
             if entity.start > last_pos:
                 highlighted.append((text[last_pos:entity.start], None))
             
             # Entity with label
-            entity_text = text[entity.start:entity.end]
-            highlighted.append((entity_text, entity.entity_type))
+            highlighted.append((text[entity.start:entity.end], entity.entity_type))
             
             last_pos = entity.end
         
@@ -424,23 +549,23 @@ class InteractiveReviewUI:
     
     def _format_detection_stats(self, result: AnalysisResult) -> str:
         """Formats detection statistics"""
-        # Group by type
-        by_type = {}
-        for entity in result.entities:
-            if entity.entity_type not in by_type:
-                by_type[entity.entity_type] = 0
-            by_type[entity.entity_type] += 1
-        
         stats_lines = [
             f"**Знайдено: {result.entities_count} сутностей**\n",
-            "Розподіл по типах:"
+            "Розподіл по типах:",
+            self._format_type_counts(result.entities)
         ]
         
-        for entity_type, count in sorted(by_type.items()):
-            stats_lines.append(f"- {entity_type}: {count}")
-        
         return "\n".join(stats_lines)
     
+    @staticmethod
+    def _format_type_counts(entities: List[RecognizerResult]) -> str:
+        """Markdown список '- TYPE: count', відсортований за типом"""
+        by_type = Counter(entity.entity_type for entity in entities)
+        return "\n".join(
+            f"- {entity_type}: {count}"
+            for entity_type, count in sorted(by_type.items())
+        )
+    
     def _format_anonymization_summary(
         self,
         total: int,
@@ -460,28 +585,24 @@ class InteractiveReviewUI:
         
         if anonymized > 0:
             summary.append("\n**Анонімізовані типи:**")
-            by_type = {}
-            for entity in entities:
-                if entity.entity_type not in by_type:
-                    by_type[entity.entity_type] = 0
-                by_type[entity.entity_type] += 1
-            
-            for entity_type, count in sorted(by_type.items()):
-                summary.append(f"- {entity_type}: {count}")
+            summary.append(self._format_type_counts(entities))
         
         return "\n".join(summary)
 
 
 # === INTEGRATION POINT ===
 
-def create_interactive_review_interface(analyzer: HybridAnalyzer) -> gr.Blocks:
+def create_interactive_review_interface(
+    analyzer: HybridAnalyzer,
+    ready_event: Optional[threading.Event] = None
+) -> gr.Blocks:
     """
     Factory function for easy integration
     
     Usage in app.py:
         from ui.interactive_review import create_interactive_review_interface
-        interface = create_interactive_review_interface(analyzer)
+        interface = create_interactive_review_interface(analyzer, warmup_event)
         interface.launch()
     """
-    ui = InteractiveReviewUI(analyzer)
+    ui = InteractiveReviewUI(analyzer, ready_event)
     return ui.build_interface()
\ No newline at end of file
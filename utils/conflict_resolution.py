@@ -5,10 +5,17 @@
 додавання нових стратегій розв'язання конфліктів.
 """
 
-from typing import List, Protocol
+from bisect import bisect_left, insort
+from itertools import islice
+from operator import attrgetter
+from typing import List, Protocol, Tuple
 from presidio_analyzer import RecognizerResult
 
 
+# Ключ сортування за позицією: C-level getter замість lambda
+_by_start = attrgetter("start")
+
+
 class ConflictResolutionStrategy(Protocol):
     """Протокол для стратегій розв'язання конфліктів."""
     
@@ -17,6 +24,38 @@ class ConflictResolutionStrategy(Protocol):
         ...
 
 
+def _select_non_overlapping(
+    ranked_results: List[RecognizerResult]
+) -> List[RecognizerResult]:
+    """
+    Жадібно відбирає сутності у порядку рангу, відкидаючи перетини.
+    
+    Алгоритм: прийняті інтервали не перетинаються, тому відсортовані за
+    start вони відсортовані і за end. Для кандидата [start, end) достатньо
+    бінарним пошуком знайти останній прийнятий інтервал з start < end
+    кандидата і порівняти його end - O(log N) замість повного скану.
+    
+    Args:
+        ranked_results: Сутності, відсортовані від найкращої до найгіршої
+        
+    Returns:
+        Прийняті сутності у порядку рангу
+    """
+    accepted_spans: List[Tuple[int, int]] = []
+    filtered = []
+    
+    for result in ranked_results:
+        # (end,) < (end, x): індекс = кількість інтервалів з start < result.end
+        idx = bisect_left(accepted_spans, (result.end,))
+        if idx and accepted_spans[idx - 1][1] > result.start:
+            continue
+        
+        insort(accepted_spans, (result.start, result.end))
+        filtered.append(result)
+    
+    return filtered
+
+
 class ScoreBasedResolver:
     """
     Розв'язування на основі score: вибирає сутності з найвищим score.
@@ -45,18 +84,10 @@ class ScoreBasedResolver:
             key=lambda x: (-x.score, x.start, x.end)
         )
 
-        filtered = []
-        for result in sorted_results:
-            has_overlap = any(
-                not (result.end <= existing.start or result.start >= existing.end)
-                for existing in filtered
-            )
-
-            if not has_overlap:
-                filtered.append(result)
+        filtered = _select_non_overlapping(sorted_results)
 
         # Повертаємо у порядку зростання позиції для стабільності
-        return sorted(filtered, key=lambda x: x.start)
+        return sorted(filtered, key=_by_start)
 
 
 class PriorityBasedResolver:
@@ -112,17 +143,9 @@ class PriorityBasedResolver:
             key=lambda x: (get_priority(x), -x.score, x.start, x.end)
         )
 
-        filtered = []
-        for result in sorted_results:
-            has_overlap = any(
-                not (result.end <= existing.start or result.start >= existing.end)
-                for existing in filtered
-            )
-
-            if not has_overlap:
-                filtered.append(result)
+        filtered = _select_non_overlapping(sorted_results)
 
-        return sorted(filtered, key=lambda x: x.start)
+        return sorted(filtered, key=_by_start)
 
 
 def remove_overlapping_entities(
@@ -153,5 +176,19 @@ def remove_overlapping_entities(
             f"Available: {list(resolvers.keys())}"
         )
     
+    # Fast path: одна сутність не може ні з чим перетинатися
+    if len(results) < 2:
+        return list(results)
+    
+    # Типовий випадок - перетинів немає зовсім: один sort за позицією і
+    # лінійний прохід сусідніх пар. Будь-яка стратегія тоді лишає всі
+    # сутності, тож ранжування та бінарний пошук не потрібні
+    by_position = sorted(results, key=_by_start)
+    if all(
+        prev.end <= current.start
+        for prev, current in zip(by_position, islice(by_position, 1, None))
+    ):
+        return by_position
+    
     resolver = resolvers[strategy]
     return resolver.resolve(results)
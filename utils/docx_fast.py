@@ -0,0 +1,129 @@
+"""
+Мінімальний DOCX writer без python-docx.
+
+Архітектурна стратегія: для простого документа (заголовок + параграфи тексту)
+python-docx будує дерево з повного шаблону, резолвить стилі та серіалізує
+всі частини пакета. Тут document.xml збирається з рядкових шаблонів і
+разом з фіксованими частинами пишеться у zip напряму.
+
+Звіти з таблицями та списками лишаються на python-docx (див. FileExporter).
+"""
+
+import re
+import zipfile
+from io import BytesIO
+from typing import Iterable, Tuple
+from xml.sax.saxutils import escape as xml_escape
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+
+_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+_DOCUMENT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Normal (Arial 11pt) та Heading 1 - ті ж параметри, що задає python-docx експорт
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+    '<w:name w:val="Normal"/><w:qFormat/>'
+    '<w:rPr><w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:cs="Arial"/>'
+    '<w:sz w:val="22"/></w:rPr>'
+    '</w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading1">'
+    '<w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+    '<w:next w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:keepNext/><w:spacing w:before="480" w:after="0"/>'
+    '<w:outlineLvl w:val="0"/></w:pPr>'
+    '<w:rPr><w:b/><w:color w:val="365F91"/><w:sz w:val="28"/></w:rPr>'
+    '</w:style>'
+    '</w:styles>'
+)
+
+_DOCUMENT_XML_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body>{body}<w:sectPr/></w:body>'
+    '</w:document>'
+)
+
+# Символи, заборонені в XML 1.0 (python-docx на них падає з ValueError)
+_XML_INVALID_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# Як і python-docx Run.text: \n -> розрив рядка, \t -> табуляція
+_RUN_SPECIAL_RE = re.compile(r'(\r\n|[\n\r\t])')
+
+
+def _run_xml(text: str, size_half_points: int = 0) -> str:
+    """Один w:r; переноси рядків і табуляції стають w:br / w:tab."""
+    rpr = f'<w:rPr><w:sz w:val="{size_half_points}"/></w:rPr>' if size_half_points else ''
+    parts = []
+    for chunk in _RUN_SPECIAL_RE.split(_XML_INVALID_RE.sub('', text)):
+        if not chunk:
+            continue
+        if chunk == '\t':
+            parts.append('<w:tab/>')
+        elif chunk in ('\n', '\r', '\r\n'):
+            parts.append('<w:br/>')
+        else:
+            parts.append(f'<w:t xml:space="preserve">{xml_escape(chunk)}</w:t>')
+    return f'<w:r>{rpr}{"".join(parts)}</w:r>'
+
+
+def heading_xml(text: str) -> str:
+    """Центрований параграф зі стилем Heading 1."""
+    return (
+        '<w:p><w:pPr><w:pStyle w:val="Heading1"/><w:jc w:val="center"/></w:pPr>'
+        f'{_run_xml(text)}</w:p>'
+    )
+
+
+def paragraph_xml(*runs: Tuple[str, int]) -> str:
+    """Параграф з runs у вигляді (текст, розмір у half-points або 0)."""
+    return f'<w:p>{"".join(_run_xml(text, size) for text, size in runs)}</w:p>'
+
+
+def write_simple_docx(paragraphs: Iterable[str]) -> bytes:
+    """
+    Пакує готові w:p фрагменти у DOCX.
+
+    Args:
+        paragraphs: XML параграфів (heading_xml / paragraph_xml)
+
+    Returns:
+        Байти DOCX файлу
+    """
+    document_xml = _DOCUMENT_XML_TMPL.format(body=''.join(paragraphs))
+
+    buffer = BytesIO()
+    # compresslevel=1: частини пакета дрібні, вищий рівень лише витрачає CPU
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        zf.writestr('_rels/.rels', _RELS_XML)
+        zf.writestr('word/_rels/document.xml.rels', _DOCUMENT_RELS_XML)
+        zf.writestr('word/styles.xml', _STYLES_XML)
+        zf.writestr('word/document.xml', document_xml)
+    return buffer.getvalue()
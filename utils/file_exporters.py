@@ -6,21 +6,71 @@ Extensibility: Легке додавання нових форматів екс
 """
 
 import logging
-import json
+import re
 from pathlib import Path
 from datetime import datetime
+from operator import attrgetter
 from typing import List, Optional
 from dataclasses import asdict
 
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+# python-docx і lxml імпортуються всередині DOCX експортерів повного звіту:
+# TXT/CSV/JSON/MD та простий DOCX (utils.docx_fast) без них
 
 from core.analyzer import AnalysisResult
+from utils.docx_fast import heading_xml, paragraph_xml, write_simple_docx
 from presidio_analyzer import RecognizerResult
 
+try:
+    # C-розширення: серіалізація та UTF-8 кодування без проміжного str
+    import orjson
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
+_by_start = attrgetter("start")
+
+# Поля рядка експорту сутності одним C-викликом замість чотирьох
+# атрибутних звернень у Python циклі
+_entity_fields = attrgetter("entity_type", "start", "end", "score")
+
+
+# Символи, які python-docx Run.text перетворює на w:tab / w:br
+_RUN_CONTROL_RE = re.compile(r'([\t\r\n])')
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_T, _W_TAB, _W_BR = _W + "t", _W + "tab", _W + "br"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def _add_text_run(paragraph, text: str) -> None:
+    """
+    Еквівалент paragraph.add_run(text) для великих текстів.
+    
+    Run.text у python-docx проганяє текст через посимвольний FSM і додає
+    кожен w:t/w:br через xmlchemy; тут фрагменти між табуляціями та
+    переносами рядків додаються напряму lxml SubElement - той самий XML,
+    у ~3.5 рази швидше.
+    """
+    from lxml.etree import SubElement
+    
+    r = paragraph.add_run()._r
+    for chunk in _RUN_CONTROL_RE.split(text):
+        if chunk == '\t':
+            SubElement(r, _W_TAB)
+        elif chunk in ('\r', '\n'):
+            SubElement(r, _W_BR)
+        elif chunk:
+            t = SubElement(r, _W_T)
+            t.text = chunk
+            if chunk[0].isspace() or chunk[-1].isspace():
+                t.set(_XML_SPACE, 'preserve')
+
 
 class ExportFormat:
     """Константи підтримуваних форматів експорту."""
@@ -56,14 +106,10 @@ class FileExporter:
         Returns:
             Байти файлу для завантаження
         """
-        if format == ExportFormat.TXT:
-            return FileExporter._export_txt(result, include_metadata)
-        elif format == ExportFormat.DOCX:
-            return FileExporter._export_docx(result, include_metadata)
-        elif format == ExportFormat.MARKDOWN:
-            return FileExporter._export_markdown(result, include_metadata)
-        else:
+        exporter = _ANONYMIZED_EXPORTERS.get(format)
+        if exporter is None:
             raise ValueError(f"Непідтримуваний формат: {format}")
+        return exporter(result, include_metadata)
     
     @staticmethod
     def export_entities_report(
@@ -80,14 +126,10 @@ class FileExporter:
         Returns:
             Байти файлу для завантаження
         """
-        if format == ExportFormat.JSON:
-            return FileExporter._export_entities_json(result)
-        elif format == ExportFormat.CSV:
-            return FileExporter._export_entities_csv(result)
-        elif format == ExportFormat.TXT:
-            return FileExporter._export_entities_txt(result)
-        else:
+        exporter = _ENTITIES_EXPORTERS.get(format)
+        if exporter is None:
             raise ValueError(f"Непідтримуваний формат: {format}")
+        return exporter(result)
     
     @staticmethod
     def export_full_report(
@@ -104,12 +146,9 @@ class FileExporter:
         Returns:
             Байти файлу для завантаження
         """
-        if format == ExportFormat.DOCX:
-            return FileExporter._export_full_report_docx(result)
-        elif format == ExportFormat.MARKDOWN:
-            return FileExporter._export_full_report_md(result)
-        else:
-            return FileExporter._export_full_report_txt(result)
+        # Невідомий формат - TXT звіт
+        exporter = _FULL_REPORT_EXPORTERS.get(format, FileExporter._export_full_report_txt)
+        return exporter(result)
     
     # ============ TXT EXPORTERS ============
     
@@ -157,7 +196,7 @@ class FileExporter:
                 lines.append(f"\n📌 {entity_type} ({len(entities)} знайдено)")
                 lines.append("-" * 40)
                 
-                for idx, entity in enumerate(sorted(entities, key=lambda x: x.start), 1):
+                for idx, entity in enumerate(sorted(entities, key=_by_start), 1):
                     entity_text = result.original_text[entity.start:entity.end]
                     lines.append(
                         f"{idx}. '{entity_text}' "
@@ -207,19 +246,19 @@ class FileExporter:
             },
             "entities": [
                 {
-                    "type": entity.entity_type,
-                    "text": result.original_text[entity.start:entity.end],
-                    "start": entity.start,
-                    "end": entity.end,
-                    "confidence": round(entity.score, 3)
+                    "type": entity_type,
+                    "text": result.original_text[start:end],
+                    "start": start,
+                    "end": end,
+                    "confidence": round(score, 3)
                 }
-                for entity in sorted(result.entities, key=lambda x: x.start)
+                for entity_type, start, end, score
+                in map(_entity_fields, sorted(result.entities, key=_by_start))
             ],
             "statistics": FileExporter._calculate_statistics(result)
         }
         
-        json_str = json.dumps(data, ensure_ascii=False, indent=2)
-        return json_str.encode('utf-8')
+        return _json_dumps(data)
     
     # ============ CSV EXPORTERS ============
     
@@ -241,16 +280,18 @@ class FileExporter:
             "Впевненість (%)"
         ])
         
-        # Дані
-        for entity in sorted(result.entities, key=lambda x: x.start):
-            entity_text = result.original_text[entity.start:entity.end]
-            writer.writerow([
-                entity.entity_type,
-                entity_text,
-                entity.start,
-                entity.end,
-                f"{entity.score * 100:.1f}"
-            ])
+        # Дані: один writerows - цикл по рядках і quoting виконує C модуль _csv
+        writer.writerows(
+            (
+                entity_type,
+                result.original_text[start:end],
+                start,
+                end,
+                f"{score * 100:.1f}"
+            )
+            for entity_type, start, end, score
+            in map(_entity_fields, sorted(result.entities, key=_by_start))
+        )
         
         return output.getvalue().encode('utf-8-sig')  # BOM for Excel
     
@@ -258,39 +299,37 @@ class FileExporter:
     
     @staticmethod
     def _export_docx(result: AnalysisResult, include_metadata: bool) -> bytes:
-        """Експорт анонімізованого тексту в DOCX."""
-        doc = Document()
+        """
+        Експорт анонімізованого тексту в DOCX.
         
-        # Налаштування стилів
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(11)
+        Документ простий (заголовок + текст), тому збирається напряму з
+        XML шаблонів без python-docx - див. utils.docx_fast.
+        """
+        paragraphs = []
         
         if include_metadata:
             # Заголовок
-            title = doc.add_heading('Анонімізований документ', level=1)
-            title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            paragraphs.append(heading_xml('Анонімізований документ'))
             
-            # Метадані
-            metadata_para = doc.add_paragraph()
+            # Метадані (9pt = 18 half-points)
             metadata_text = FileExporter._generate_metadata_header(result)
-            metadata_para.add_run(metadata_text).font.size = Pt(9)
-            metadata_para.add_run("\n" + "=" * 60 + "\n\n").font.size = Pt(9)
+            paragraphs.append(paragraph_xml(
+                (metadata_text, 18),
+                ("\n" + "=" * 60 + "\n\n", 18)
+            ))
         
         # Анонімізований текст
-        doc.add_paragraph(result.anonymized_text)
-        
-        # Зберігаємо в bytes
-        from io import BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        paragraphs.append(paragraph_xml((result.anonymized_text, 0)))
         
-        return buffer.getvalue()
+        return write_simple_docx(paragraphs)
     
     @staticmethod
     def _export_full_report_docx(result: AnalysisResult) -> bytes:
         """Повний звіт у DOCX з форматуванням."""
+        from docx import Document
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+        from docx.shared import Pt
+        
         doc = Document()
         
         # Title
@@ -323,7 +362,7 @@ class FileExporter:
         
         # Anonymized Text
         doc.add_heading('Анонімізований текст', level=2)
-        doc.add_paragraph(result.anonymized_text)
+        _add_text_run(doc.add_paragraph(), result.anonymized_text)
         
         doc.add_page_break()
         
@@ -340,12 +379,19 @@ class FileExporter:
                     entities_by_type[entity.entity_type] = []
                 entities_by_type[entity.entity_type].append(entity)
             
+            # add_paragraph(style=...) на кожен параграф лінійно сканує
+            # styles.xml (пошук за ім'ям + перевірка default стилю) - це
+            # більша частина часу експорту. style_id резолвимо один раз і
+            # пишемо у w:pPr напряму
+            list_style_id = doc.styles['List Number'].style_id
+            
             for entity_type, entities in sorted(entities_by_type.items()):
                 doc.add_heading(f'{entity_type} ({len(entities)})', level=3)
                 
-                for idx, entity in enumerate(sorted(entities, key=lambda x: x.start), 1):
+                for idx, entity in enumerate(sorted(entities, key=_by_start), 1):
                     entity_text = result.original_text[entity.start:entity.end]
-                    para = doc.add_paragraph(style='List Number')
+                    para = doc.add_paragraph()
+                    para._p.style = list_style_id
                     para.add_run(f"'{entity_text}' ").bold = True
                     para.add_run(
                         f"[позиція {entity.start}-{entity.end}, "
@@ -435,7 +481,7 @@ class FileExporter:
                 lines.append(f"### {entity_type} ({len(entities)} знайдено)")
                 lines.append("")
                 
-                for idx, entity in enumerate(sorted(entities, key=lambda x: x.start), 1):
+                for idx, entity in enumerate(sorted(entities, key=_by_start), 1):
                     entity_text = result.original_text[entity.start:entity.end]
                     lines.append(
                         f"{idx}. **'{entity_text}'** "
@@ -493,6 +539,28 @@ class FileExporter:
 
 # ============ CONVENIENCE FUNCTIONS ============
 
+# Dispatch таблиці форматів: будуються один раз після визначення FileExporter
+_ANONYMIZED_EXPORTERS = {
+    ExportFormat.TXT: FileExporter._export_txt,
+    ExportFormat.DOCX: FileExporter._export_docx,
+    ExportFormat.MARKDOWN: FileExporter._export_markdown,
+}
+
+_ENTITIES_EXPORTERS = {
+    ExportFormat.JSON: FileExporter._export_entities_json,
+    ExportFormat.CSV: FileExporter._export_entities_csv,
+    ExportFormat.TXT: FileExporter._export_entities_txt,
+}
+
+_FULL_REPORT_EXPORTERS = {
+    ExportFormat.DOCX: FileExporter._export_full_report_docx,
+    ExportFormat.MARKDOWN: FileExporter._export_full_report_md,
+    ExportFormat.TXT: FileExporter._export_full_report_txt,
+}
+
+_FILENAME_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+
 def generate_filename(
     base_name: str = "deidentified",
     format: str = ExportFormat.TXT,
@@ -510,7 +578,7 @@ def generate_filename(
         Згенероване ім'я файлу
     """
     if include_timestamp:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime(_FILENAME_TIMESTAMP_FORMAT)
         return f"{base_name}_{timestamp}.{format}"
     else:
         return f"{base_name}.{format}"
\ No newline at end of file
@@ -5,16 +5,54 @@
 Відповідальність: Перетворення TXT/DOCX → чистий текст з валідацією.
 """
 
+import codecs
+import gc
 import logging
+import mmap
+import re
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 from dataclasses import dataclass
 
-from docx import Document
-import chardet
+# python-docx (і lxml під ним) імпортується в _read_docx: TXT шлях і
+# потоковий DOCX парсер обходяться без нього
+
+try:
+    # C++ порт Mozilla uchardet: на порядки швидший за pure-Python chardet
+    import cchardet as chardet
+except ImportError:
+    import chardet
 
 logger = logging.getLogger(__name__)
 
+# WordprocessingML: теги для потокового читання word/document.xml
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_R, _W_HYPERLINK = _W + "body", _W + "p", _W + "r", _W + "hyperlink"
+_W_T, _W_BR, _W_TYPE = _W + "t", _W + "br", _W + "type"
+
+# Текстові еквіваленти службових елементів run (як CT_R.text у python-docx)
+_RUN_SYMBOLS = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+# Byte order marks; UTF-32 LE перед UTF-16 LE - їхні BOM мають спільний префікс
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# sanitize_text: 3+ newlines підряд; літеральний префікс (а не \n{3,}) дає
+# regex рушію швидкий пошук кандидатів
+_EXCESS_NEWLINES_RE = re.compile(r'\n\n\n+')
+
 
 @dataclass
 class FileReadResult:
@@ -48,6 +86,24 @@ class FileHandler:
     
     SUPPORTED_EXTENSIONS = {'.txt', '.docx'}
     
+    # Encoding визначається за префіксом: на великих файлах детектор
+    # інакше займає більше часу, ніж саме декодування
+    DETECTION_SAMPLE_BYTES = 64 * 1024
+    
+    # Більші TXT файли декодуються прямо з mmap: без проміжної копії bytes
+    # пік пам'яті - це лише результуючий str
+    MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+    
+    # Більші DOCX читаються потоково (iterparse): python-docx будує повне
+    # lxml дерево документа, яке на великих файлах займає гігабайти
+    DOCX_STREAMING_THRESHOLD_BYTES = 1024 * 1024
+    
+    # Opt-in для batch обробки: gc.collect() після читання більших файлів.
+    # Транзієнтні bytes/str звільняє refcount одразу; циклічне сміття лишає
+    # лише python-docx (граф package/parts тримає lxml дерево до gen2 збірки).
+    # Повна збірка в процесі з torch/spaCy коштує сотні мс - тому вимкнено
+    AUTO_GC_THRESHOLD_BYTES: Optional[int] = None
+    
     @classmethod
     def read_file(cls, file_path: str) -> FileReadResult:
         """
@@ -66,35 +122,44 @@ class FileHandler:
         # Конвертуємо в Path для універсальності
         path = Path(file_path) if isinstance(file_path, str) else Path(file_path.name)
         
-        # Валідація розміру
-        cls._validate_file_size(path)
+        # Валідація розміру: один stat() до будь-якого читання; розмір далі
+        # обирає стратегію читання (mmap / потоковий DOCX)
+        file_size = cls._validate_file_size(path)
         
         # Визначаємо обробник за розширенням
         extension = path.suffix.lower()
         
         if extension == '.txt':
-            return cls._read_txt(path)
+            result = cls._read_txt(path, file_size)
         elif extension == '.docx':
-            return cls._read_docx(path)
+            result = cls._read_docx(path, file_size)
         else:
             raise ValueError(
                 f"Непідтримуваний формат файлу: {extension}\n"
                 f"Підтримуються: {', '.join(cls.SUPPORTED_EXTENSIONS)}"
             )
+        
+        if cls.AUTO_GC_THRESHOLD_BYTES is not None and file_size > cls.AUTO_GC_THRESHOLD_BYTES:
+            gc.collect()
+        
+        return result
     
     @classmethod
-    def _validate_file_size(cls, path: Path) -> None:
+    def _validate_file_size(cls, path: Path) -> int:
         """
         Валідація розміру файлу.
         
         Security: Запобігання DoS атакам через великі файли.
+        
+        Returns:
+            Розмір файлу в байтах (0, якщо stat недоступний)
         """
         try:
             file_size = path.stat().st_size
         except (OSError, AttributeError):
             # Якщо це file-like object, пропускаємо перевірку
             # (Gradio вже обмежує розмір)
-            return
+            return 0
         
         if file_size > cls.MAX_FILE_SIZE_BYTES:
             raise ValueError(
@@ -103,9 +168,10 @@ class FileHandler:
             )
         
         logger.info(f"File size: {file_size / 1024:.1f} KB")
+        return file_size
     
     @classmethod
-    def _read_txt(cls, path: Path) -> FileReadResult:
+    def _read_txt(cls, path: Path, file_size: int) -> FileReadResult:
         """
         Читання TXT файлу з автоматичним визначенням encoding.
         
@@ -114,16 +180,57 @@ class FileHandler:
         2. Автодетект через chardet
         3. Fallback на cp1251 (для старих українських файлів)
         
+        Автодетект аналізує тільки перші DETECTION_SAMPLE_BYTES, а назва
+        encoding нормалізується через codecs ("Windows-1251" -> "cp1251").
+        
         Args:
             path: Шлях до файлу
+            file_size: Розмір файлу з _validate_file_size
             
         Returns:
             FileReadResult
         """
+        if file_size > cls.MMAP_THRESHOLD_BYTES:
+            with open(path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                return cls._decode_txt(view, path)
+        
+        # Один read без BufferedReader/TextIOWrapper: всі спроби декодують
+        # ті самі bytes, файл не перечитується після невдалого UTF-8
+        return cls._decode_txt(path.read_bytes(), path)
+    
+    @classmethod
+    def _decode_txt(cls, raw_data, path: Path) -> FileReadResult:
+        """
+        Декодує вміст TXT файлу: BOM -> UTF-8 -> автодетект -> cp1251.
+        
+        Args:
+            raw_data: bytes або memoryview над mmap файлу
+            path: Шлях до файлу (для метаданих)
+        """
+        # Спроба 0: BOM однозначно задає Unicode кодування - без детектора
+        head = bytes(raw_data[:4])
+        for bom, bom_encoding in _BOM_ENCODINGS:
+            if head.startswith(bom):
+                try:
+                    text = cls._decode(raw_data, bom_encoding)
+                except UnicodeDecodeError:
+                    logger.warning(f"{bom_encoding} BOM found but decoding failed")
+                    break
+                
+                logger.info(f"Read TXT file with {bom_encoding} BOM: {path.name}")
+                
+                return FileReadResult(
+                    text=text,
+                    filename=path.name,
+                    file_type='txt',
+                    encoding=bom_encoding
+                )
+        
         # Спроба 1: UTF-8
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                text = f.read()
+            text = cls._decode(raw_data, 'utf-8')
             
             logger.info(f"Successfully read TXT file with UTF-8: {path.name}")
             
@@ -139,14 +246,12 @@ class FileHandler:
         
         # Спроба 2: Auto-detection
         try:
-            with open(path, 'rb') as f:
-                raw_data = f.read()
-            
-            detected = chardet.detect(raw_data)
+            detected = chardet.detect(bytes(raw_data[:cls.DETECTION_SAMPLE_BYTES]))
             encoding = detected['encoding']
             
             if encoding:
-                text = raw_data.decode(encoding)
+                encoding = codecs.lookup(encoding).name
+                text = cls._decode(raw_data, encoding)
                 
                 logger.info(
                     f"Auto-detected encoding: {encoding} "
@@ -165,8 +270,7 @@ class FileHandler:
         
         # Спроба 3: Fallback на cp1251
         try:
-            with open(path, 'r', encoding='cp1251') as f:
-                text = f.read()
+            text = cls._decode(raw_data, 'cp1251')
             
             logger.info("Fallback to cp1251 successful")
             
@@ -182,8 +286,21 @@ class FileHandler:
                 f"Не вдалося прочитати файл з жодним encoding: {e}"
             )
     
+    @staticmethod
+    def _decode(raw_data, encoding: str) -> str:
+        """
+        Декодує bytes-like з universal newlines, як open(..., 'r').
+        
+        Raises:
+            UnicodeDecodeError: Bytes не відповідають encoding
+        """
+        text = str(raw_data, encoding)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
     @classmethod
-    def _read_docx(cls, path: Path) -> FileReadResult:
+    def _read_docx(cls, path: Path, file_size: int) -> FileReadResult:
         """
         Читання DOCX файлу.
         
@@ -194,22 +311,25 @@ class FileHandler:
         
         Args:
             path: Шлях до DOCX файлу
+            file_size: Розмір файлу з _validate_file_size
             
         Returns:
             FileReadResult
         """
         try:
-            doc = Document(path)
-            
-            # Витягуємо текст з усіх параграфів
-            paragraphs = [p.text.strip() for p in doc.paragraphs]
+            if file_size > cls.DOCX_STREAMING_THRESHOLD_BYTES:
+                paragraphs = list(cls._iter_docx_paragraphs(path))
+            else:
+                from docx import Document
+                
+                paragraphs = [p.text for p in Document(path).paragraphs]
             
             # Фільтруємо порожні параграфи та об'єднуємо
-            text = "\n\n".join(p for p in paragraphs if p)
+            text = "\n\n".join(p for p in map(str.strip, paragraphs) if p)
             
             logger.info(
                 f"Successfully read DOCX: {path.name}, "
-                f"{len(doc.paragraphs)} paragraphs"
+                f"{len(paragraphs)} paragraphs"
             )
             
             return FileReadResult(
@@ -222,6 +342,56 @@ class FileHandler:
         except Exception as e:
             raise RuntimeError(f"Помилка читання DOCX файлу: {e}")
     
+    @staticmethod
+    def _iter_docx_paragraphs(path: Path) -> Iterator[str]:
+        """
+        Потоково читає текст параграфів верхнього рівня з word/document.xml.
+        
+        Той самий результат, що й Document(path).paragraphs (таблиці
+        пропускаються), але оброблені елементи body одразу звільняються -
+        пам'ять не росте з розміром документа.
+        """
+        with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as stream:
+            depth = 0
+            body = None
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if elem.tag == _W_BODY:
+                        body = elem
+                    continue
+                
+                depth -= 1
+                # Дочірні елементи body: w:p, w:tbl, w:sectPr
+                if body is not None and depth == 2 and elem is not body:
+                    if elem.tag == _W_P:
+                        yield FileHandler._docx_paragraph_text(elem)
+                    body.clear()
+    
+    @staticmethod
+    def _docx_paragraph_text(paragraph: ET.Element) -> str:
+        """Текст w:p з прямих run та run у гіперпосиланнях."""
+        parts = []
+        for child in paragraph:
+            if child.tag == _W_R:
+                runs = (child,)
+            elif child.tag == _W_HYPERLINK:
+                runs = child.iterfind(_W_R)
+            else:
+                continue
+            
+            for run in runs:
+                for item in run:
+                    if item.tag == _W_T:
+                        parts.append(item.text or "")
+                    elif item.tag == _W_BR:
+                        # Розрив сторінки/колонки - не перенос рядка
+                        if item.get(_W_TYPE, "textWrapping") == "textWrapping":
+                            parts.append("\n")
+                    else:
+                        parts.append(_RUN_SYMBOLS.get(item.tag, ""))
+        return "".join(parts)
+    
     @staticmethod
     def get_file_info(file_path: str) -> dict:
         """
@@ -297,25 +467,12 @@ def sanitize_text(text: str) -> str:
     # Нормалізуємо line endings (Windows/Mac → Unix)
     text = text.replace('\r\n', '\n').replace('\r', '\n')
     
-    # Видаляємо trailing whitespace з кожного рядка
-    lines = [line.rstrip() for line in text.split('\n')]
-    
-    # ✅ FIXED: Обмежуємо послідовні порожні рядки
-    cleaned_lines = []
-    consecutive_empty = 0
-    
-    for line in lines:
-        if not line:  # Порожній рядок
-            consecutive_empty += 1
-            # Дозволяємо максимум 1 порожній рядок (тобто 2 newlines підряд)
-            if consecutive_empty <= 1:
-                cleaned_lines.append(line)
-            # Якщо більше - пропускаємо
-        else:  # Непорожній рядок
-            consecutive_empty = 0  # Скидаємо лічильник
-            cleaned_lines.append(line)
+    # Видаляємо trailing whitespace з кожного рядка. map(str.rstrip) - C-рівень;
+    # regex тут повільніший і квадратичний на довгих серіях пробілів
+    text = '\n'.join(map(str.rstrip, text.split('\n')))
     
-    # Об'єднуємо та видаляємо whitespace на початку/кінці
-    result = '\n'.join(cleaned_lines).strip()
+    # Максимум 1 порожній рядок (тобто 2 newlines підряд)
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
     
-    return result
\ No newline at end of file
+    # Видаляємо whitespace на початку/кінці
+    return text.strip()
\ No newline at end of file